@@ -0,0 +1,235 @@
+import random
+import re
+import time
+
+from abc import ABCMeta, abstractmethod
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, ClassVar
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from organisation.models import Grade, Profession, Unit
+from skills.models import Category, Skill, SkillEntry
+from users.models import Gender, Profile
+
+# Budgets are checked against a small and a larger dataset. A view whose
+# query count differs between the two has a query inside a loop.
+BUDGET_SIZES = (10, 60)
+
+DEFAULT_SECONDS = 1.0
+
+SEED_EMAIL = 'budget{}@example.com'
+
+
+def seed(users: int):
+    # Grows the dataset to the given number of seeded users, each with a
+    # profile and entries for a random subset of skills, and adds a
+    # category of skills for every five users. Calls are cumulative, so
+    # a test can measure at one size and then seed up to the next.
+    rng = random.Random(users)
+    User = get_user_model()
+    existing = User.objects.filter(email__startswith='budget').count()
+    root, _ = Category.objects.get_or_create(name='Budget', parent=None)
+    for i in range(existing // 5, users // 5):
+        category = Category(name=f'Budget {i}', parent=root)
+        category.save()
+        Skill.objects.bulk_create(
+            Skill(name=f'Budget {i}.{j}', category=category)
+            for j in range(3)
+        )
+    created = User.objects.bulk_create(
+        User(email=SEED_EMAIL.format(i), password='!')
+        for i in range(existing, users)
+    )
+    gender_ids = list(Gender.objects.values_list('id', flat=True))
+    grade_ids = list(Grade.objects.values_list('id', flat=True))
+    profession_ids = list(Profession.objects.values_list('id', flat=True))
+    unit_ids = list(Unit.objects.values_list('id', flat=True))
+    Profile.objects.bulk_create(
+        Profile(
+            user=user,
+            gender_id=rng.choice(gender_ids),
+            grade_id=rng.choice(grade_ids),
+            profession_id=rng.choice(profession_ids),
+            unit_id=rng.choice(unit_ids),
+            years_as_analyst=rng.randint(0, 30),
+            years_at_current_grade=rng.randint(0, 10),
+        )
+        for user in created
+    )
+    skill_ids = list(Skill.objects.values_list('id', flat=True))
+    SkillEntry.bulk_upsert(
+        (user.pk, skill_id, rng.randint(0, 4), rng.random() < 0.5)
+        for user in created
+        for skill_id in rng.sample(skill_ids, len(skill_ids) // 2)
+    )
+
+
+@dataclass(frozen=True)
+class Visit:
+    # One request against a named URL. Unless anonymous is set, the
+    # request is made as the first seeded user, or as a staff user.
+    name: str
+    queries: int
+    seconds: float = DEFAULT_SECONDS
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    params: dict[str, Any] = field(default_factory=dict)
+    method: str = 'get'
+    data: Any = None
+    content_type: str | None = None
+    anonymous: bool = False
+    staff: bool = False
+
+    @property
+    def label(self) -> str:
+        label = f'{self.method.upper()} {self.name}'
+        if self.params:
+            label = f'{label}?{urlencode(self.params, doseq=True)}'
+        return label
+
+
+@dataclass
+class Measurement:
+    status: int
+    queries: list[str]
+    seconds: float
+
+
+_LITERALS = re.compile(r"'[^']*'|\b\d+\b")
+
+
+def describe_queries(queries: list[str]) -> str:
+    # Statements are grouped with their literals blanked out, so a query
+    # repeated once per row shows up as one line with a high count.
+    shapes = Counter(_LITERALS.sub('?', sql) for sql in queries)
+    return '\n'.join(
+        f'  {count} x {sql}' for sql, count in shapes.most_common()
+    )
+
+
+# The mixin is typed as a TestCase, but is not one at runtime, so that
+# test discovery does not collect it on its own.
+if TYPE_CHECKING:
+    _TestCase = TestCase
+else:
+    _TestCase = object
+
+
+class ViewBudgetMixin(_TestCase, metaclass=ABCMeta):
+    # Mixed into a TestCase to check that every URL in an app namespace
+    # stays within its query and wall-time budgets at each dataset size.
+    # Each visit is made twice, once against an empty cache and once
+    # against the cache the first request filled.
+    namespace: ClassVar[str]
+    client: Client
+
+    @abstractmethod
+    def get_visits(self) -> list[Visit]:
+        ...
+
+    def get_url_names(self) -> set[str]:
+        urlpatterns = import_module(f'{self.namespace}.urls').urlpatterns
+        return {
+            f'{self.namespace}:{pattern.name}'
+            for pattern in urlpatterns
+        }
+
+    def login(self, visit: Visit):
+        self.client.logout()
+        if visit.anonymous:
+            return
+        User = get_user_model()
+        if visit.staff:
+            user = User.objects.filter(is_staff=True).earliest('pk')
+        else:
+            user = User.objects.get(email=SEED_EMAIL.format(0))
+        self.client.force_login(user)
+
+    def request(self, visit: Visit) -> Measurement:
+        method: Callable[..., Any] = getattr(self.client, visit.method)
+        path = reverse(visit.name, kwargs=visit.kwargs)
+        if visit.params:
+            path = f'{path}?{urlencode(visit.params, doseq=True)}'
+        kwargs: dict[str, Any] = {}
+        if visit.data is not None:
+            kwargs['data'] = visit.data
+        if visit.content_type is not None:
+            kwargs['content_type'] = visit.content_type
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            response = method(path, **kwargs)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            seconds = time.perf_counter() - start
+        return Measurement(
+            status=response.status_code,
+            queries=[query['sql'] for query in context.captured_queries],
+            seconds=seconds,
+        )
+
+    def assert_within_budget(
+        self,
+        visit: Visit,
+        measurement: Measurement,
+    ):
+        self.assertLess(
+            measurement.status,
+            400,
+            f'{visit.label} returned {measurement.status}.',
+        )
+        self.assertLessEqual(
+            len(measurement.queries),
+            visit.queries,
+            f'{visit.label} made {len(measurement.queries)} queries, over '
+            f'its budget of {visit.queries}:\n'
+            f'{describe_queries(measurement.queries)}',
+        )
+        self.assertLessEqual(
+            measurement.seconds,
+            visit.seconds,
+            f'{visit.label} took {measurement.seconds:.3f}s, over its '
+            f'budget of {visit.seconds:.3f}s.',
+        )
+
+    def test_every_url_has_a_budget(self):
+        seed(BUDGET_SIZES[0])
+        visited = {visit.name for visit in self.get_visits()}
+        self.assertEqual(self.get_url_names() - visited, set())
+
+    def test_budgets_do_not_grow_with_data(self):
+        counts: dict[tuple[str, int], int] = {}
+        for size in BUDGET_SIZES:
+            seed(size)
+            for visit in self.get_visits():
+                cache.clear()
+                for attempt in range(2):
+                    # Logging in saves the user, so the warm pass reuses
+                    # the first pass's login unless the visit ended it.
+                    signed_in = '_auth_user_id' in self.client.session
+                    if attempt == 0 or visit.anonymous or not signed_in:
+                        self.login(visit)
+                    measurement = self.request(visit)
+                    with self.subTest(visit.label, size=size, pass_=attempt):
+                        self.assert_within_budget(visit, measurement)
+                    baseline = counts.setdefault(
+                        (visit.label, attempt),
+                        len(measurement.queries),
+                    )
+                    with self.subTest(visit.label, size=size, pass_=attempt):
+                        self.assertEqual(
+                            len(measurement.queries),
+                            baseline,
+                            f'{visit.label} made {baseline} queries with '
+                            f'{BUDGET_SIZES[0]} users and '
+                            f'{len(measurement.queries)} with {size}:\n'
+                            f'{describe_queries(measurement.queries)}',
+                        )
@@ -0,0 +1,130 @@
+import shutil
+import sys
+import tempfile
+import time
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.test.utils import override_settings
+
+from .routers import primary_reads
+
+
+def _generation_key(name: str) -> str:
+    return f'generation:{name}'
+
+
+def _seed() -> int:
+    # Counters start from the clock, so a counter that has been evicted
+    # never restarts at a value that older results were cached under.
+    return time.time_ns()
+
+
+def get_generations(*names: str) -> dict[str, int]:
+    keys = {_generation_key(name): name for name in names}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        cache.add(key, _seed(), timeout=None)
+        found[key] = cache.get(key, 0)
+    return {name: found[key] for key, name in keys.items()}
+
+
+def get_generation(name: str) -> int:
+    return get_generations(name)[name]
+
+
+def _increment(name: str):
+    key = _generation_key(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _seed(), timeout=None)
+
+
+def bump_generation(name: str):
+    # The counter is bumped straight away so the writing transaction sees
+    # its own changes, and again on commit in case another process rebuilt
+    # its results from the old data in the meantime.
+    _increment(name)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _increment(name))
+
+
+def generational_key(prefix: str, *names: str) -> str:
+    generations = get_generations(*names)
+    suffix = ':'.join(str(generations[name]) for name in names)
+    return f'{prefix}:{suffix}'
+
+
+T = TypeVar('T')
+
+_memo: dict[str, tuple[str, Any]] = {}
+
+
+def get_or_build(
+    prefix: str,
+    generations: tuple[str, ...],
+    build: Callable[[], T],
+) -> T:
+    # Values are shared between processes through the cache under a key
+    # made from the given generations, and also kept in this process until
+    # any of those generations changes.
+    key = generational_key(prefix, *generations)
+    memo = _memo.get(prefix)
+    if memo is not None and memo[0] == key:
+        return memo[1]
+    value = cache.get(key)
+    if value is None:
+        with primary_reads():
+            value = build()
+        cache.set(key, value, timeout=None)
+    _memo[prefix] = (key, value)
+    return value
+
+
+@contextmanager
+def private_cache() -> Iterator[None]:
+    # Swaps the default cache for a file-based one in a temporary
+    # directory, for tests and benchmarks whose data must never reach the
+    # shared cache, nor be served from it.
+    location = tempfile.mkdtemp(prefix='cardano-cache-')
+    _memo.clear()
+    try:
+        with override_settings(CACHES={
+            'default': {
+                'BACKEND': (
+                    'django.core.cache.backends.filebased.FileBasedCache'
+                ),
+                'LOCATION': location,
+                # It is discarded afterwards, so it never needs culling.
+                'OPTIONS': {'MAX_ENTRIES': sys.maxsize},
+            },
+        }):
+            yield
+    finally:
+        _memo.clear()
+        shutil.rmtree(location, ignore_errors=True)
+
+
+class GenerationalQuerySet(models.QuerySet[Any]):
+    # Bulk writes send no model signals, so they bump the generations here.
+    # bulk_update() is implemented in terms of update().
+    generations: tuple[str, ...] = ()
+
+    def _bump_generations(self):
+        for name in self.generations:
+            bump_generation(name)
+
+    def update(self, **kwargs: Any) -> int:
+        rows = super().update(**kwargs)
+        self._bump_generations()
+        return rows
+
+    def bulk_create(self, *args: Any, **kwargs: Any) -> list[Any]:
+        objs = super().bulk_create(*args, **kwargs)
+        self._bump_generations()
+        return objs
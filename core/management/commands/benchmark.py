@@ -0,0 +1,180 @@
+import json
+import platform
+import statistics
+import time
+
+from collections.abc import Callable
+from typing import Any
+
+import django
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from core.caching import private_cache
+from core.synthetic import (
+    SYNTHETIC_EMAIL,
+    SYNTHETIC_PASSWORD,
+    Volumes,
+    generate,
+)
+from skills.models import Category, Skill
+from skills.skeleton import get_skeleton
+
+# The overview submission rates this many skills at a time.
+SUBMITTED_SKILLS = 50
+
+
+def _time(case: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    case()
+    return time.perf_counter() - start
+
+
+class _QueryCounter:
+    # Counted with an execute wrapper rather than from connection.queries,
+    # which stops growing once it holds settings.DEBUG's maximum.
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Times the skeleton build, overview, category, matrix and login at '
+        'each scale of synthetic data and writes the results as JSON. The '
+        'data for each scale is generated inside a transaction that is '
+        'rolled back, and cached in a private cache that is discarded.'
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            '--scales',
+            type=int,
+            nargs='+',
+            default=[100, 1000],
+            help='Numbers of users to generate.',
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--label',
+            default='',
+            help='Recorded with the results, e.g. a commit hash.',
+        )
+        parser.add_argument('--output', help='Defaults to stdout.')
+
+    def handle(self, *args: Any, **options: Any):
+        setup_test_environment()
+        try:
+            with private_cache():
+                results = [
+                    result
+                    for scale in options['scales']
+                    for result in self.run_scale(
+                        scale,
+                        options['repeat'],
+                        options['seed'],
+                    )
+                ]
+        finally:
+            teardown_test_environment()
+        report = json.dumps({
+            'label': options['label'],
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'repeat': options['repeat'],
+            'results': results,
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(report)
+        else:
+            self.stdout.write(report)
+
+    def run_scale(
+        self,
+        scale: int,
+        repeat: int,
+        seed: int,
+    ) -> list[dict[str, Any]]:
+        with transaction.atomic():
+            self.stderr.write(f'Generating {scale} users...')
+            generate(Volumes(users=scale, seed=seed))
+            results = [
+                {'scale': scale, 'case': name, **self.measure(case, repeat)}
+                for name, case in self.get_cases().items()
+            ]
+            transaction.set_rollback(True)
+        return results
+
+    def get_cases(self) -> dict[str, Callable[[], Any]]:
+        User = get_user_model()
+        email = SYNTHETIC_EMAIL.format(
+            User.objects.filter(email__startswith='synthetic').count() - 1,
+        )
+        member = Client()
+        member.force_login(User.objects.get(email=email))
+        visitor = Client()
+        skill_ids = Skill.objects.order_by('?').values_list(
+            'id',
+            flat=True,
+        )[:SUBMITTED_SKILLS]
+        submission = {f'p{skill_id}': '2' for skill_id in skill_ids}
+        # The root generated for this scale has the largest subtree.
+        root = Category.objects.filter(
+            parent=None,
+            name__startswith='Synthetic',
+        ).latest('pk')
+        category_url = reverse('skills:category', kwargs={'pk': root.pk})
+
+        def login():
+            visitor.post(
+                reverse('users:login'),
+                {'email': email, 'password': SYNTHETIC_PASSWORD},
+            )
+            visitor.logout()
+
+        return {
+            'skeleton': lambda: get_skeleton(root.pk),
+            'overview_get': lambda: member.get(reverse('skills:overview')),
+            'category': lambda: member.get(category_url, {'partial': 1}),
+            'overview_post': lambda: member.post(
+                reverse('skills:overview'),
+                submission,
+            ),
+            'matrix': lambda: member.get(reverse('skills:matrix')),
+            'login': login,
+        }
+
+    def measure(
+        self,
+        case: Callable[[], Any],
+        repeat: int,
+    ) -> dict[str, Any]:
+        # The first run starts from an empty cache. The rest reuse
+        # whatever it cached, as most requests in production would.
+        cache.clear()
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            cold = _time(case)
+        warm = [_time(case) for _ in range(repeat)]
+        return {
+            'queries': counter.count,
+            'cold': cold,
+            'min': min(warm, default=cold),
+            'median': statistics.median(warm) if warm else cold,
+            'max': max(warm, default=cold),
+        }
@@ -0,0 +1,117 @@
+import json
+import multiprocessing
+import random
+import statistics
+import time
+
+from typing import Any
+
+import django
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import OperationalError, connection, connections, transaction
+
+BENCHMARK_EMAIL = 'writer{}@benchmark.example.com'
+
+
+def _write(args: tuple[int, list[int], int, int]) -> dict[str, Any]:
+    # Runs in a worker process: saves the user's whole form the given
+    # number of times, as a POST to the overview would, and records how
+    # long each save took and how many failed.
+    from skills.models import SkillEntry
+    user_id, skill_ids, saves, seed = args
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    failures = 0
+    started = time.time()
+    for _ in range(saves):
+        rows = [
+            (user_id, skill_id, rng.randint(0, 4), rng.random() < 0.5)
+            for skill_id in skill_ids
+        ]
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                SkillEntry.bulk_upsert(rows)
+        except OperationalError:
+            failures += 1
+        latencies.append(time.perf_counter() - start)
+    finished = time.time()
+    connection.close()
+    return {
+        'latencies': latencies,
+        'failures': failures,
+        'started': started,
+        'finished': finished,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures write throughput under concurrent writers against the '
+        'configured database. Run it once per DATABASE_PROFILE to compare '
+        'profiles. Its users and their entries are deleted afterwards.'
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument('--saves', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Defaults to stdout.')
+
+    def handle(self, *args: Any, **options: Any):
+        from skills.models import Skill
+        User = get_user_model()
+        skill_ids = list(Skill.objects.values_list('id', flat=True))
+        users = User.objects.bulk_create(
+            User(email=BENCHMARK_EMAIL.format(i), password='!')
+            for i in range(options['writers'])
+        )
+        jobs = [
+            (user.pk, skill_ids, options['saves'], options['seed'] + i)
+            for i, user in enumerate(users)
+        ]
+        # Workers are spawned rather than forked, so that none of them
+        # inherits this process's connection.
+        connections.close_all()
+        context = multiprocessing.get_context('spawn')
+        try:
+            with context.Pool(
+                options['writers'],
+                initializer=django.setup,
+            ) as pool:
+                results = pool.map(_write, jobs)
+        finally:
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+        latencies = sorted(
+            latency for result in results for latency in result['latencies']
+        )
+        # Throughput is measured from the first write to the last, leaving
+        # out the time taken to start the workers.
+        elapsed = (
+            max(result['finished'] for result in results)
+            - min(result['started'] for result in results)
+        )
+        failures = sum(result['failures'] for result in results)
+        saves = len(latencies) - failures
+        database = settings.DATABASES['default']
+        report = json.dumps({
+            'profile': settings.DATABASE_PROFILE,
+            'engine': database['ENGINE'],
+            'writers': options['writers'],
+            'saves_per_writer': options['saves'],
+            'rows_per_save': len(skill_ids),
+            'seconds': elapsed,
+            'saves_per_second': saves / elapsed,
+            'failures': failures,
+            'median_latency': statistics.median(latencies),
+            'p95_latency': latencies[int(len(latencies) * 0.95) - 1],
+            'max_latency': latencies[-1],
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(report)
+        else:
+            self.stdout.write(report)
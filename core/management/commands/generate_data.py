@@ -0,0 +1,29 @@
+from dataclasses import asdict, fields
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from core.synthetic import Volumes, generate
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates synthetic users, profiles, organisation lookups, '
+        'categories, skills and entries at the given volumes.'
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        for volume in fields(Volumes):
+            parser.add_argument(
+                f'--{volume.name.replace("_", "-")}',
+                type=int,
+                default=volume.default,
+            )
+
+    def handle(self, *args: Any, **options: Any):
+        volumes = Volumes(**{
+            volume.name: options[volume.name] for volume in fields(Volumes)
+        })
+        generated = generate(volumes)
+        for name, count in asdict(generated).items():
+            self.stdout.write(f'{name}: {count}')
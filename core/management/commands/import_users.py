@@ -0,0 +1,171 @@
+import csv
+import os
+
+from collections.abc import Iterator, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import replace
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+import django
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from skills.bulk import write_entries
+from users.imports import UserRecord, load_lookups, parse_user, write_users
+
+_TRUE = {'1', 'true', 'yes', 'y'}
+_FALSE = {'', '0', 'false', 'no', 'n'}
+
+
+def _read(path: Path, file_format: str) -> Iterator[tuple[int, Any]]:
+    # Yields (line number, record) pairs without reading the whole file.
+    # CSV rows come out as dictionaries of strings, and JSONL lines as
+    # undecoded bytes.
+    if file_format == 'csv':
+        with path.open(newline='') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+    else:
+        with path.open('rb') as file:
+            for number, line in enumerate(file, start=1):
+                if line.strip():
+                    yield number, line
+
+
+def _typed_entry(record: Any) -> Any:
+    # CSV values are all strings, so entry fields are converted to the
+    # types a JSON record would carry before validation. Values that do
+    # not convert are left alone for validation to reject.
+    if not isinstance(record, Mapping):
+        return record
+    typed = dict(record)
+    for field in ('skill', 'proficiency'):
+        value = typed.get(field)
+        if isinstance(value, str) and value.strip().isdigit():
+            typed[field] = int(value)
+    used = typed.get('used_in_last_six_months')
+    if isinstance(used, str):
+        if used.strip().lower() in _TRUE:
+            typed['used_in_last_six_months'] = True
+        elif used.strip().lower() in _FALSE:
+            typed['used_in_last_six_months'] = False
+    return typed
+
+
+def _chunks(
+    records: Iterator[tuple[int, Any]],
+    size: int,
+) -> Iterator[list[tuple[int, Any]]]:
+    while chunk := list(islice(records, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports users with their profiles, and optionally skill entries, '
+        'from CSV or JSONL files. Users are read from rows with email, '
+        'password, gender, grade, profession, unit, years_as_analyst and '
+        'years_at_current_grade fields; entries from rows with user, '
+        'skill, proficiency and used_in_last_six_months fields.'
+    )
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument('users', nargs='?', type=Path)
+        parser.add_argument('--entries', type=Path)
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'jsonl'],
+            help='Inferred from each file\'s extension by default.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Processes used to hash passwords.',
+        )
+        parser.add_argument(
+            '--unusable-passwords',
+            action='store_true',
+            help='Ignore given passwords, e.g. for single sign-on.',
+        )
+
+    def handle(self, *args: Any, **options: Any):
+        if options['users'] is None and options['entries'] is None:
+            raise CommandError('Give a users file, an entries file or both.')
+        for name in ('users', 'entries'):
+            if options[name] is not None and not options[name].is_file():
+                raise CommandError(f'{options[name]} does not exist.')
+        if options['users'] is not None:
+            if options['workers'] > 1 and not options['unusable_passwords']:
+                with ProcessPoolExecutor(
+                    max_workers=options['workers'],
+                    initializer=django.setup,
+                ) as executor:
+                    self.import_users(options, executor)
+            else:
+                self.import_users(options, None)
+        if options['entries'] is not None:
+            self.import_entries(options)
+
+    def get_format(self, path: Path, options: dict[str, Any]) -> str:
+        if options['format']:
+            return options['format']
+        return 'csv' if path.suffix.lower() == '.csv' else 'jsonl'
+
+    def report_error(self, path: Path, number: int, error: str):
+        self.stderr.write(f'{path.name}:{number}: {error}')
+
+    def import_users(
+        self,
+        options: dict[str, Any],
+        executor: Executor | None,
+    ):
+        path: Path = options['users']
+        lookups = load_lookups()
+        records = _read(path, self.get_format(path, options))
+        created = skipped = errors = 0
+        for chunk in _chunks(records, options['chunk_size']):
+            parsed: list[UserRecord] = []
+            for number, record in chunk:
+                try:
+                    user = parse_user(record, lookups)
+                except ValueError as error:
+                    self.report_error(path, number, str(error))
+                    errors += 1
+                    continue
+                if options['unusable_passwords']:
+                    user = replace(user, password=None)
+                parsed.append(user)
+            users, existing = write_users(parsed, executor)
+            for user in existing:
+                self.stderr.write(f'{user.email} already exists, skipped.')
+            created += len(users)
+            skipped += len(existing)
+        self.stdout.write(
+            f'Users: {created} created, {skipped} skipped, {errors} errors.',
+        )
+
+    def import_entries(self, options: dict[str, Any]):
+        path: Path = options['entries']
+        records = (
+            (number, _typed_entry(record))
+            for number, record in _read(path, self.get_format(path, options))
+        )
+        counts = {'written': 0, 'unchanged': 0, 'error': 0}
+        for chunk in _chunks(records, options['chunk_size']):
+            for result in write_entries(chunk):
+                counts[result['status']] += 1
+                if result['status'] == 'error':
+                    self.report_error(path, result['line'], result['error'])
+        self.stdout.write(
+            f'Entries: {counts["written"]} written, '
+            f'{counts["unchanged"]} unchanged, {counts["error"]} errors.',
+        )
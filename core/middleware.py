@@ -0,0 +1,41 @@
+from inspect import iscoroutinefunction
+from typing import Any
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+
+from .routers import start_request
+
+PIN_COOKIE = 'pin_primary'
+
+
+@sync_and_async_middleware
+def replica_pin_middleware(get_response: Any) -> Any:
+    # A request that writes is pinned to the primary for the rest of its
+    # reads, and so are the same client's requests for the following
+    # REPLICA_PIN_SECONDS, which covers the redirect after a form post
+    # while the replica catches up.
+    def finish(response: HttpResponse, wrote: bool) -> HttpResponse:
+        if wrote:
+            response.set_cookie(
+                PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    if iscoroutinefunction(get_response):
+        async def async_middleware(request: HttpRequest) -> HttpResponse:
+            routing = start_request(PIN_COOKIE in request.COOKIES)
+            response = await get_response(request)
+            return finish(response, routing.wrote)
+        return async_middleware
+
+    def middleware(request: HttpRequest) -> HttpResponse:
+        routing = start_request(PIN_COOKIE in request.COOKIES)
+        response = get_response(request)
+        return finish(response, routing.wrote)
+    return middleware
@@ -0,0 +1,115 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any
+
+from django.conf import settings
+from django.db import connections, router
+
+REPLICA = 'replica'
+
+# Sessions and users are read on every request to authenticate it, and
+# must not lag behind a login.
+_PRIMARY_ONLY = {'sessions.Session', settings.AUTH_USER_MODEL}
+
+
+@dataclass
+class _Routing:
+    pinned: bool = False
+    wrote: bool = False
+    reporting: bool = False
+
+
+# Set afresh by replica_pin_middleware for each request, and left in place
+# afterwards so that streamed responses still read from the replica.
+_routing: ContextVar[_Routing | None] = ContextVar('routing', default=None)
+
+
+def start_request(pinned: bool) -> _Routing:
+    routing = _Routing(pinned=pinned)
+    _routing.set(routing)
+    return routing
+
+
+def reporting(view: Callable[..., Any]) -> Callable[..., Any]:
+    # Marks a view as read-only reporting, whose reads may go to the
+    # replica unless the request has been pinned to the primary.
+    def mark():
+        routing = _routing.get()
+        if routing is not None:
+            routing.reporting = True
+
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            mark()
+            return await view(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        mark()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def replica_timeout(model: Any) -> int | None:
+    # Results built from the replica may lag the generations they are
+    # cached under, so they are kept for no longer than the replica may
+    # lag. Results built from the primary last until the next write.
+    if router.db_for_read(model) == REPLICA:
+        return settings.REPLICA_PIN_SECONDS
+    return None
+
+
+@contextmanager
+def primary_reads() -> Iterator[None]:
+    # For cached data that a user must see their own changes to as soon
+    # as the next request, such as the taxonomy and reference data, which
+    # change rarely. Reporting aggregates use replica_timeout() instead.
+    routing = _routing.get()
+    if routing is None or not routing.reporting:
+        yield
+        return
+    routing.reporting = False
+    try:
+        yield
+    finally:
+        routing.reporting = True
+
+
+class ReplicaRouter:
+    # Sends reads from reporting views to the replica, if one is
+    # configured. Everything else uses the primary, as do all reads after
+    # a request has written, so a request always sees its own writes.
+    def __init__(self):
+        self.replica = REPLICA if REPLICA in settings.DATABASES else None
+
+    def db_for_read(self, model: Any, **hints: Any) -> str | None:
+        routing = _routing.get()
+        if (
+            self.replica is None
+            or routing is None
+            or not routing.reporting
+            or routing.pinned
+            or model._meta.label in _PRIMARY_ONLY
+            or connections['default'].in_atomic_block
+        ):
+            return None
+        return self.replica
+
+    def db_for_write(self, model: Any, **hints: Any) -> str | None:
+        routing = _routing.get()
+        if routing is not None:
+            routing.pinned = routing.wrote = True
+        return None
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> bool:
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool:
+        # The replica gets its schema from the primary.
+        return db != REPLICA
@@ -0,0 +1,19 @@
+from contextlib import ExitStack
+from typing import Any
+
+from django.test.runner import DiscoverRunner
+
+from .caching import private_cache
+
+
+class TestRunner(DiscoverRunner):
+    # Each run gets a cache of its own, never shared with the development
+    # server.
+    def setup_test_environment(self, **kwargs: Any):
+        super().setup_test_environment(**kwargs)
+        self._stack = ExitStack()
+        self._stack.enter_context(private_cache())
+
+    def teardown_test_environment(self, **kwargs: Any):
+        self._stack.close()
+        super().teardown_test_environment(**kwargs)
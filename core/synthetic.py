@@ -0,0 +1,155 @@
+import random
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import TypeVar
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from organisation.models import Grade, Profession, Unit
+from skills.models import Category, Skill, SkillEntry
+from users.models import Gender, Profile
+
+T = TypeVar('T')
+
+SYNTHETIC_EMAIL = 'synthetic{}@example.com'
+SYNTHETIC_PASSWORD = 'password'
+
+# Entries are written a batch of users at a time, which keeps memory flat
+# at any volume.
+USER_BATCH_SIZE = 500
+
+# Most people rate themselves towards the middle of the scale.
+_PROFICIENCY_WEIGHTS = (10, 25, 35, 20, 10)
+
+
+@dataclass(frozen=True)
+class Volumes:
+    users: int = 1000
+    depth: int = 3
+    fan_out: int = 4
+    skills_per_category: int = 5
+    entries_per_user: int = 20
+    grades: int = 7
+    professions: int = 4
+    units: int = 3
+    seed: int = 0
+
+
+@dataclass
+class Generated:
+    categories: int = 0
+    skills: int = 0
+    users: int = 0
+    entries: int = 0
+
+
+def _batches(iterable: Iterable[T], size: int) -> Iterator[list[T]]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _make_lookups(model: type, prefix: str, count: int) -> list[int]:
+    # Topped up to the requested count, alongside whatever already exists.
+    existing = model.objects.count()
+    model.objects.bulk_create(
+        model(name=f'{prefix} {i}') for i in range(existing, count)
+    )
+    return list(model.objects.values_list('id', flat=True))
+
+
+def _make_categories(volumes: Volumes) -> list[Category]:
+    # One new root per run, with a full tree of the given depth and
+    # fan-out below it. Paths and labels are filled in level by level,
+    # as each level's ids are only known once it has been inserted.
+    existing = Category.objects.filter(
+        parent=None,
+        name__startswith='Synthetic',
+    ).count()
+    root = Category(name=f'Synthetic {existing}')
+    root.save()
+    categories = [root]
+    level = [root]
+    for _ in range(volumes.depth - 1):
+        level = Category.objects.bulk_create(
+            Category(name=f'{parent.name}.{i}', parent=parent)
+            for parent in level
+            for i in range(volumes.fan_out)
+        )
+        parents = {category.pk: category for category in categories}
+        for category in level:
+            parent = parents[category.parent_id]
+            category.path = f'{parent.path}{category.pk}/'
+            category.label = f'{parent.label} -> {category.name}'
+        Category.objects.bulk_update(level, ['path', 'label'])
+        categories.extend(level)
+    return categories
+
+
+def generate(volumes: Volumes) -> Generated:
+    rng = random.Random(volumes.seed)
+    generated = Generated()
+    User = get_user_model()
+    gender_ids = list(Gender.objects.values_list('id', flat=True))
+    grade_ids = _make_lookups(Grade, 'Grade', volumes.grades)
+    profession_ids = _make_lookups(
+        Profession,
+        'Profession',
+        volumes.professions,
+    )
+    unit_ids = _make_lookups(Unit, 'Unit', volumes.units)
+    with transaction.atomic():
+        categories = _make_categories(volumes)
+        skills = Skill.objects.bulk_create(
+            Skill(name=f'{category.name} skill {i}', category=category)
+            for category in categories
+            for i in range(volumes.skills_per_category)
+        )
+    generated.categories = len(categories)
+    generated.skills = len(skills)
+    skill_ids = list(Skill.objects.values_list('id', flat=True))
+    entries_per_user = min(volumes.entries_per_user, len(skill_ids))
+    # Every user shares one hash, so only one is computed per run.
+    password = make_password(SYNTHETIC_PASSWORD)
+    existing = User.objects.filter(email__startswith='synthetic').count()
+    emails = (
+        SYNTHETIC_EMAIL.format(i)
+        for i in range(existing, existing + volumes.users)
+    )
+    for batch in _batches(emails, USER_BATCH_SIZE):
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                User(email=email, password=password) for email in batch
+            )
+            Profile.objects.bulk_create(
+                Profile(
+                    user=user,
+                    gender_id=rng.choice(gender_ids),
+                    grade_id=rng.choice(grade_ids),
+                    profession_id=rng.choice(profession_ids),
+                    unit_id=rng.choice(unit_ids),
+                    years_as_analyst=rng.randint(0, 30),
+                    years_at_current_grade=rng.randint(0, 10),
+                )
+                for user in users
+            )
+            written = SkillEntry.bulk_upsert(
+                (
+                    user.pk,
+                    skill_id,
+                    rng.choices(
+                        SkillEntry.Proficiency.values,
+                        _PROFICIENCY_WEIGHTS,
+                    )[0],
+                    rng.random() < 0.4,
+                )
+                for user in users
+                for skill_id in rng.sample(skill_ids, entries_per_user)
+            )
+        generated.users += len(users)
+        generated.entries += len(written)
+    return generated
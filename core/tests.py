@@ -1,3 +1,267 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
 
-# Create your tests here.
+from importlib import import_module, reload
+from io import StringIO
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import URLResolver
+
+from organisation.models import Grade, Profession, Unit
+from skills.models import Skill, SkillEntry
+from users.models import Gender, User
+from website.settings import database
+from website.urls import urlpatterns
+
+from .budgets import ViewBudgetMixin
+from .routers import (
+    REPLICA,
+    ReplicaRouter,
+    primary_reads,
+    replica_timeout,
+    reporting,
+    start_request,
+)
+
+
+class ViewBudgetCoverageTests(SimpleTestCase):
+    def test_every_namespace_has_budgets(self):
+        # Each app included in the root URLconf, other than the admin,
+        # needs a budget test case covering its namespace. The test cases
+        # themselves check that every URL in the namespace is visited.
+        namespaces = {
+            pattern.namespace
+            for pattern in urlpatterns
+            if isinstance(pattern, URLResolver)
+            and pattern.namespace not in (None, 'admin')
+        }
+        for namespace in namespaces:
+            with self.subTest(namespace):
+                module = import_module(f'{namespace}.tests')
+                self.assertTrue(any(
+                    isinstance(value, type)
+                    and issubclass(value, ViewBudgetMixin)
+                    and getattr(value, 'namespace', None) == namespace
+                    for value in vars(module).values()
+                ))
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.router.replica = REPLICA
+
+    def read(self, pinned: bool = False) -> str | None:
+        start_request(pinned=pinned)
+        return reporting(
+            lambda: self.router.db_for_read(SkillEntry),
+        )()
+
+    def test_reporting_reads_use_the_replica(self):
+        self.assertEqual(self.read(), REPLICA)
+
+    def test_other_reads_use_the_primary(self):
+        start_request(pinned=False)
+        self.assertIsNone(self.router.db_for_read(SkillEntry))
+
+    def test_users_are_read_from_the_primary(self):
+        start_request(pinned=False)
+        self.assertIsNone(reporting(
+            lambda: self.router.db_for_read(User),
+        )())
+
+    def test_pinned_requests_use_the_primary(self):
+        self.assertIsNone(self.read(pinned=True))
+
+    def test_writes_pin_the_request(self):
+        routing = start_request(pinned=False)
+        self.router.db_for_write(SkillEntry)
+        self.assertTrue(routing.wrote)
+        self.assertIsNone(reporting(
+            lambda: self.router.db_for_read(SkillEntry),
+        )())
+
+    def test_cached_results_are_built_from_the_primary(self):
+        def read() -> list[str | None]:
+            with primary_reads():
+                inside = self.router.db_for_read(SkillEntry)
+            return [inside, self.router.db_for_read(SkillEntry)]
+
+        start_request(pinned=False)
+        self.assertEqual(reporting(read)(), [None, REPLICA])
+
+    @override_settings(REPLICA_PIN_SECONDS=5)
+    def test_results_from_the_replica_expire(self):
+        timeout = reporting(lambda: replica_timeout(SkillEntry))
+        with mock.patch('core.routers.router', self.router):
+            start_request(pinned=False)
+            self.assertEqual(timeout(), 5)
+            start_request(pinned=True)
+            self.assertIsNone(timeout())
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class ImportUsersTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write(self, name: str, *lines: str) -> Path:
+        path = self.directory / name
+        path.write_text('\n'.join(lines) + '\n')
+        return path
+
+    def run_command(self, *args: object) -> tuple[str, str]:
+        stdout, stderr = StringIO(), StringIO()
+        call_command(
+            'import_users',
+            *map(str, args),
+            '--workers',
+            '1',
+            stdout=stdout,
+            stderr=stderr,
+        )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_users_and_entries_are_imported(self):
+        User.objects.create(email='taken@example.com')
+        profile = ','.join([
+            Gender.objects.earliest('pk').name,
+            Grade.objects.earliest('pk').name,
+            Profession.objects.earliest('pk').name,
+            Unit.objects.earliest('pk').name,
+        ])
+        users = self.write(
+            'users.csv',
+            'email,password,gender,grade,profession,unit,'
+            'years_as_analyst,years_at_current_grade',
+            f'new@example.com,secret,{profile},3,1',
+            'bare@example.com,,,,,,,',
+            'taken@example.com,,,,,,,',
+            'invalid,,,,,,,',
+        )
+        skill = Skill.objects.get(name='Python')
+        entries = self.write('entries.jsonl', *(
+            json.dumps(record) for record in [
+                {'user': 'new@example.com', 'skill': skill.id,
+                 'proficiency': 3, 'used_in_last_six_months': True},
+                {'user': 'nobody@example.com', 'skill': skill.id,
+                 'proficiency': 3},
+            ]
+        ))
+        stdout, stderr = self.run_command(users, '--entries', entries)
+        self.assertEqual(stdout.splitlines(), [
+            'Users: 2 created, 1 skipped, 1 errors.',
+            'Entries: 1 written, 0 unchanged, 1 errors.',
+        ])
+        self.assertEqual(stderr.splitlines(), [
+            'users.csv:5: Invalid email.',
+            'taken@example.com already exists, skipped.',
+            'entries.jsonl:2: Unknown user.',
+        ])
+        new = User.objects.get(email='new@example.com')
+        self.assertTrue(new.check_password('secret'))
+        self.assertEqual(
+            (new.profile.years_as_analyst, new.profile.grade_id),
+            (3, Grade.objects.earliest('pk').pk),
+        )
+        bare = User.objects.get(email='bare@example.com')
+        self.assertFalse(bare.has_usable_password())
+        self.assertFalse(hasattr(bare, 'profile'))
+        entry = SkillEntry.objects.get(user=new)
+        self.assertEqual(
+            (entry.skill_id, entry.proficiency, entry.used_in_last_six_months),
+            (skill.id, 3, True),
+        )
+
+    def test_reimported_entries_are_unchanged(self):
+        user = User.objects.create(email='entries@example.com')
+        skill = Skill.objects.get(name='Python')
+        entries = self.write(
+            'entries.csv',
+            'user,skill,proficiency,used_in_last_six_months',
+            f'{user.email},{skill.id},2,no',
+        )
+        self.run_command('--entries', entries)
+        stdout, _ = self.run_command('--entries', entries)
+        self.assertEqual(
+            stdout.strip(),
+            'Entries: 0 written, 1 unchanged, 0 errors.',
+        )
+
+    def test_missing_files_are_refused(self):
+        with self.assertRaisesMessage(CommandError, 'does not exist.'):
+            self.run_command(self.directory / 'missing.csv')
+
+
+class DatabaseProfileTests(SimpleTestCase):
+    def load(self, **environ: str) -> dict[str, Any]:
+        variables = {
+            name: value for name, value in os.environ.items()
+            if not name.startswith('DATABASE_')
+        }
+        # Reloaded again afterwards, with the real environment.
+        self.addCleanup(reload, database)
+        with mock.patch.dict(os.environ, {**variables, **environ}, clear=True):
+            return reload(database).DATABASES
+
+    def test_sqlite_is_tuned_by_default(self):
+        default = self.load()['default']
+        self.assertEqual(default['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertIsNone(default['CONN_MAX_AGE'])
+        self.assertIn(
+            'PRAGMA journal_mode=WAL;',
+            default['OPTIONS']['init_command'],
+        )
+        self.assertEqual(default['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertEqual(default['OPTIONS']['timeout'], 20)
+
+    def test_untuned_sqlite_keeps_the_defaults(self):
+        default = self.load(DATABASE_PROFILE='sqlite-untuned')['default']
+        self.assertNotIn('OPTIONS', default)
+        self.assertNotIn('CONN_MAX_AGE', default)
+
+    def test_postgresql_is_pooled(self):
+        default = self.load(
+            DATABASE_PROFILE='postgresql',
+            DATABASE_POOL_MAX='20',
+            DATABASE_SERVER_SIDE_CURSORS='false',
+        )['default']
+        self.assertEqual(default['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(default['CONN_MAX_AGE'], 0)
+        self.assertEqual(default['OPTIONS']['pool']['max_size'], 20)
+        self.assertTrue(default['DISABLE_SERVER_SIDE_CURSORS'])
+
+    def test_replicas_share_the_primary_settings(self):
+        databases = self.load(DATABASE_REPLICA_NAME='replica.sqlite3')
+        self.assertEqual(databases['replica']['NAME'], 'replica.sqlite3')
+        self.assertEqual(
+            databases['replica']['OPTIONS'],
+            databases['default']['OPTIONS'],
+        )
+        self.assertNotIn('replica', self.load())
+
+    def test_unknown_profiles_are_refused(self):
+        with self.assertRaisesMessage(ValueError, 'Unknown DATABASE_PROFILE'):
+            self.load(DATABASE_PROFILE='oracle')
+
+
+class SQLiteConnectionTests(TestCase):
+    def test_pragmas_are_applied(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Only SQLite connections are tuned with pragmas.')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(
+                cursor.fetchone()[0],
+                database.SQLITE_PRAGMAS['busy_timeout'],
+            )
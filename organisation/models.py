@@ -1,8 +1,17 @@
 from django.db import models
 
+from core.caching import GenerationalQuerySet
+
+REFERENCE_GENERATION = 'organisation.reference'
+
+
+class ReferenceQuerySet(GenerationalQuerySet):
+    generations = (REFERENCE_GENERATION,)
+
 
 class Grade(models.Model):
     name = models.CharField(max_length=255, unique=True)
+    objects = ReferenceQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -13,6 +22,7 @@ class Grade(models.Model):
 
 class Profession(models.Model):
     name = models.CharField(max_length=255, unique=True)
+    objects = ReferenceQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -23,6 +33,7 @@ class Profession(models.Model):
 
 class Unit(models.Model):
     name = models.CharField(max_length=255, unique=True)
+    objects = ReferenceQuerySet.as_manager()
 
     def __str__(self):
         return self.name
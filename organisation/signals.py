@@ -0,0 +1,15 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.caching import bump_generation
+
+from .models import REFERENCE_GENERATION, Grade, Profession, Unit
+
+
+@receiver([post_save, post_delete], sender=Grade)
+@receiver([post_save, post_delete], sender=Profession)
+@receiver([post_save, post_delete], sender=Unit)
+def reference_changed(**kwargs: Any):
+    bump_generation(REFERENCE_GENERATION)
@@ -0,0 +1,70 @@
+from typing import Any
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from core.caching import generational_key
+from core.routers import replica_timeout
+from organisation.models import REFERENCE_GENERATION
+from users.models import PROFILE_GENERATION
+
+from .models import ENTRY_GENERATION, SkillEntry
+
+BREAKDOWN_DIMENSIONS = {
+    'gender': 'user__profile__gender__name',
+    'grade': 'user__profile__grade__name',
+    'profession': 'user__profile__profession__name',
+    'unit': 'user__profile__unit__name',
+}
+
+
+def _compute_breakdown(
+    dimension: str,
+    skill_id: int | None,
+) -> list[dict[str, Any]]:
+    entries = SkillEntry.objects.all()
+    if skill_id is not None:
+        entries = entries.filter(skill_id=skill_id)
+    rows = entries.values_list(
+        BREAKDOWN_DIMENSIONS[dimension],
+        'proficiency',
+    ).annotate(
+        total=Count('id'),
+        used=Count('id', filter=Q(used_in_last_six_months=True)),
+    ).order_by(BREAKDOWN_DIMENSIONS[dimension], 'proficiency')
+    groups: dict[str | None, dict[str, Any]] = {}
+    for name, proficiency, total, used in rows:
+        group = groups.setdefault(name, {
+            'name': name,
+            'total': 0,
+            'used_in_last_six_months': 0,
+            'proficiency': {
+                str(value): 0 for value in SkillEntry.Proficiency.values
+            },
+        })
+        group['total'] += total
+        group['used_in_last_six_months'] += used
+        group['proficiency'][str(proficiency)] = total
+    return list(groups.values())
+
+
+def proficiency_breakdown(
+    dimension: str,
+    skill_id: int | None = None,
+) -> list[dict[str, Any]]:
+    # Each breakdown is one GROUP BY over entries joined to profiles and
+    # the lookup table, cached until entries, profiles or lookups next
+    # change, or for as long as the replica may lag if read from it.
+    if dimension not in BREAKDOWN_DIMENSIONS:
+        raise ValueError(f'Unknown dimension {dimension!r}.')
+    key = generational_key(
+        f'skills:breakdown:{dimension}:{skill_id}',
+        ENTRY_GENERATION,
+        PROFILE_GENERATION,
+        REFERENCE_GENERATION,
+    )
+    breakdown = cache.get(key)
+    if breakdown is None:
+        breakdown = _compute_breakdown(dimension, skill_id)
+        cache.set(key, breakdown, timeout=replica_timeout(SkillEntry))
+    return breakdown
@@ -0,0 +1,167 @@
+import hmac
+
+from itertools import islice
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_not_required
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.views.decorators.http import require_GET, require_POST
+
+from core.routers import reporting
+
+from .bulk import write_entries
+from .experts import (
+    EXPERT_FILTERS,
+    EXPERTS_LIMIT,
+    EXPERTS_MAX_LIMIT,
+    EXPERTS_MAX_REQUIREMENTS,
+    RECENT_BONUS,
+    find_experts,
+    parse_requirement,
+)
+from .models import SkillEntry
+from .pagination import paginate_by_last_modified
+
+API_PAGE_SIZE = 500
+API_MAX_PAGE_SIZE = 5000
+BULK_CHUNK_SIZE = 1000
+
+
+def _serialise(entry: SkillEntry) -> dict[str, Any]:
+    return {
+        'id': entry.id,
+        'user': entry.user.email,
+        'skill': entry.skill_id,
+        'proficiency': entry.proficiency,
+        'used_in_last_six_months': entry.used_in_last_six_months,
+        'last_modified': entry.last_modified.isoformat(),
+    }
+
+
+def _has_api_token(request: HttpRequest) -> bool:
+    scheme, _, token = request.headers.get('Authorization', '').partition(
+        ' ',
+    )
+    return scheme.lower() == 'bearer' and any(
+        hmac.compare_digest(token.encode(), known.encode())
+        for known in settings.API_TOKENS
+    )
+
+
+@login_not_required
+@require_GET
+@reporting
+def entries(request: HttpRequest) -> HttpResponse:
+    # Pages through every entry. Machine clients authenticate with an API
+    # token as for bulk writes, and get a JSON error rather than the
+    # login page without one.
+    if not (_has_api_token(request) or request.user.is_authenticated):
+        response = JsonResponse(
+            {'error': 'Authentication required.'},
+            status=401,
+        )
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+    try:
+        size = int(request.GET.get('size', API_PAGE_SIZE))
+        skill_id = None
+        if 'skill' in request.GET:
+            skill_id = int(request.GET['skill'])
+    except ValueError:
+        return JsonResponse({'error': 'Invalid parameter.'}, status=400)
+    size = max(1, min(size, API_MAX_PAGE_SIZE))
+    queryset = SkillEntry.objects.select_related('user')
+    if 'user' in request.GET:
+        queryset = queryset.filter(user__email=request.GET['user'])
+    if skill_id is not None:
+        queryset = queryset.filter(skill_id=skill_id)
+    try:
+        page = paginate_by_last_modified(
+            queryset,
+            request.GET.get('cursor'),
+            size,
+        )
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+    return JsonResponse({
+        'results': [_serialise(entry) for entry in page.items],
+        'next_cursor': page.next_cursor,
+    })
+
+
+@require_GET
+@reporting
+def experts(request: HttpRequest) -> HttpResponse:
+    # Ranks people against one or more need=skill[:minimum[:weight]]
+    # requirements. With match=any, people meeting only some of them are
+    # ranked too.
+    try:
+        requirements = [
+            parse_requirement(value) for value in request.GET.getlist('need')
+        ]
+        limit = int(request.GET.get('limit', EXPERTS_LIMIT))
+        recent_bonus = float(request.GET.get('recent', RECENT_BONUS))
+        filters = {
+            name: int(request.GET[name])
+            for name in EXPERT_FILTERS
+            if request.GET.get(name)
+        }
+    except ValueError:
+        return JsonResponse({'error': 'Invalid parameter.'}, status=400)
+    if not 1 <= len(requirements) <= EXPERTS_MAX_REQUIREMENTS:
+        return JsonResponse({
+            'error': f'Between 1 and {EXPERTS_MAX_REQUIREMENTS} needs are '
+            'required.',
+        }, status=400)
+    if not 0 <= recent_bonus < float('inf'):
+        return JsonResponse({'error': 'Invalid parameter.'}, status=400)
+    match = request.GET.get('match', 'all')
+    if match not in ('all', 'any'):
+        return JsonResponse({'error': 'Invalid match.'}, status=400)
+    try:
+        results = find_experts(
+            requirements,
+            filters,
+            limit=max(1, min(limit, EXPERTS_MAX_LIMIT)),
+            recent_bonus=recent_bonus,
+            match_all=match == 'all',
+        )
+    except ValueError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+    return JsonResponse({'results': results})
+
+
+def _write_bulk_entries(request: HttpRequest) -> HttpResponse:
+    numbered = (
+        (number, line)
+        for number, line in enumerate(request, start=1)
+        if line.strip()
+    )
+    results: list[dict[str, Any]] = []
+    while chunk := list(islice(numbered, BULK_CHUNK_SIZE)):
+        results.extend(write_entries(chunk))
+    return JsonResponse({
+        'written': sum(result['status'] == 'written' for result in results),
+        'unchanged': sum(
+            result['status'] == 'unchanged' for result in results
+        ),
+        'errors': sum(result['status'] == 'error' for result in results),
+        'results': results,
+    })
+
+
+@csrf_exempt
+@login_not_required
+@require_POST
+def bulk_entries(request: HttpRequest) -> HttpResponse:
+    # Accepts newline-delimited JSON entry records, read from the body as
+    # a stream. Machine clients send one of the API_TOKENS in an
+    # "Authorization: Bearer <token>" header. Otherwise the request needs
+    # a staff user's session and a CSRF token, as from a browser.
+    if _has_api_token(request):
+        return _write_bulk_entries(request)
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Staff access required.'}, status=403)
+    return csrf_protect(_write_bulk_entries)(request)
@@ -0,0 +1,90 @@
+import json
+
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+
+from .models import SkillEntry
+from .submissions import get_skill_ids
+
+
+def parse_entry(
+    record: str | bytes | Mapping[str, Any],
+) -> tuple[str, int, int, bool]:
+    # Records are objects of the form {"user": email, "skill": id,
+    # "proficiency": n, "used_in_last_six_months": bool}, either decoded
+    # already or as a line of JSON.
+    if isinstance(record, (str, bytes)):
+        try:
+            record = json.loads(record)
+        except ValueError:
+            raise ValueError('Invalid JSON.')
+    if not isinstance(record, Mapping):
+        raise ValueError('Record must be an object.')
+    email = record.get('user')
+    skill_id = record.get('skill')
+    proficiency = record.get('proficiency')
+    used_recently = record.get('used_in_last_six_months', False)
+    if not isinstance(email, str):
+        raise ValueError('User email must be a string.')
+    if not isinstance(skill_id, int) or isinstance(skill_id, bool):
+        raise ValueError('Skill must be an integer id.')
+    # JSON true and 1.0 compare equal to 1, so the type is checked first.
+    if (
+        type(proficiency) is not int
+        or proficiency not in SkillEntry.Proficiency.values
+    ):
+        raise ValueError('Invalid proficiency value.')
+    if not isinstance(used_recently, bool):
+        raise ValueError('used_in_last_six_months must be a boolean.')
+    return email, skill_id, proficiency, used_recently
+
+
+def write_entries(
+    records: list[tuple[int, str | bytes | Mapping[str, Any]]],
+) -> Iterator[dict[str, Any]]:
+    # Each chunk resolves its users in one query and is written with one
+    # upsert in its own transaction. If the write fails, for example on a
+    # lock timeout, the chunk is rolled back and each of its records is
+    # reported as an error, while other chunks are unaffected.
+    parsed: dict[int, tuple[str, int, int, bool]] = {}
+    results: dict[int, dict[str, Any]] = {}
+    for number, record in records:
+        try:
+            parsed[number] = parse_entry(record)
+        except ValueError as error:
+            results[number] = {'status': 'error', 'error': str(error)}
+    user_ids = dict(get_user_model().objects.filter(
+        email__in={email for email, *_ in parsed.values()},
+    ).values_list('email', 'id'))
+    skill_ids = get_skill_ids()
+    rows: dict[int, tuple[int, int, int, bool]] = {}
+    for number, (email, skill_id, proficiency, used) in parsed.items():
+        if email not in user_ids:
+            results[number] = {'status': 'error', 'error': 'Unknown user.'}
+        elif skill_id not in skill_ids:
+            results[number] = {'status': 'error', 'error': 'Unknown skill.'}
+        else:
+            rows[number] = (user_ids[email], skill_id, proficiency, used)
+    try:
+        with transaction.atomic():
+            written = {
+                (entry.user_id, entry.skill_id)
+                for entry in SkillEntry.bulk_upsert(rows.values())
+            }
+    except DatabaseError:
+        written = None
+    for number, (user_id, skill_id, *_) in rows.items():
+        if written is None:
+            results[number] = {
+                'status': 'error',
+                'error': 'Database error; the record was not written.',
+            }
+        elif (user_id, skill_id) in written:
+            results[number] = {'status': 'written'}
+        else:
+            results[number] = {'status': 'unchanged'}
+    for number, _ in records:
+        yield {'line': number, **results[number]}
@@ -0,0 +1,48 @@
+import hashlib
+
+from collections.abc import Callable
+from typing import Any
+
+from django.contrib import messages
+from django.http import HttpRequest
+from django.middleware.csrf import get_token
+from django.views.decorators.http import condition
+
+Validators = list[Any]
+
+
+def _viewer(request: HttpRequest) -> list[Any]:
+    # Every page embeds the signed-in user and a CSRF token in its header,
+    # so both are part of every validator. The token is derived from the
+    # secret this response will use, which is only in the cookie from the
+    # client's second request on.
+    get_token(request)
+    return [request.user.pk, request.META['CSRF_COOKIE']]
+
+
+def conditional_page(
+    compute: Callable[..., Validators],
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    # Wraps a view so that GET requests carrying a matching If-None-Match
+    # header get a 304 before the view does any work. compute() returns
+    # the parts of the ETag, and is evaluated once per request. No
+    # Last-Modified is sent, as deletions and changes to profiles or the
+    # taxonomy alter pages without moving any timestamp forward.
+    def etag(request: HttpRequest, *args: Any, **kwargs: Any) -> str | None:
+        if not hasattr(request, '_page_etag'):
+            setattr(request, '_page_etag', None)
+            # Pending messages are only shown by a full render.
+            pending = len(messages.get_messages(request))
+            if request.method == 'GET' and not pending:
+                parts = [
+                    *_viewer(request),
+                    *compute(request, *args, **kwargs),
+                    request.GET.urlencode(),
+                ]
+                setattr(request, '_page_etag', hashlib.md5(
+                    '|'.join(map(str, parts)).encode(),
+                    usedforsecurity=False,
+                ).hexdigest())
+        return getattr(request, '_page_etag')
+
+    return condition(etag_func=etag)
@@ -0,0 +1,172 @@
+import hashlib
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.cache import cache
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    Max,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+
+from core.caching import generational_key
+from core.routers import replica_timeout
+from users.models import PROFILE_GENERATION
+
+from .models import ENTRY_GENERATION, SkillEntry
+
+EXPERTS_LIMIT = 10
+EXPERTS_MAX_LIMIT = 100
+EXPERTS_MAX_REQUIREMENTS = 20
+
+# By default recent use of a skill counts for as much as one more level of
+# proficiency in it.
+RECENT_BONUS = 1.0
+
+EXPERT_FILTERS = ('grade', 'unit')
+
+
+@dataclass(frozen=True)
+class Requirement:
+    skill_id: int
+    minimum: int = SkillEntry.Proficiency.AWARENESS
+    weight: float = 1.0
+
+
+def parse_requirement(value: str) -> Requirement:
+    # Requirements are written skill[:minimum[:weight]], e.g. 12:3:2 for
+    # at least moderate experience of skill 12, weighted double.
+    parts = value.split(':')
+    if not 1 <= len(parts) <= 3:
+        raise ValueError(f'Invalid requirement {value!r}.')
+    skill_id = int(parts[0])
+    minimum = int(parts[1]) if len(parts) > 1 else Requirement.minimum
+    weight = float(parts[2]) if len(parts) > 2 else Requirement.weight
+    if minimum not in SkillEntry.Proficiency.values:
+        raise ValueError(f'Invalid minimum proficiency {minimum}.')
+    if not 0 < weight < float('inf'):
+        raise ValueError(f'Invalid weight {weight}.')
+    return Requirement(skill_id=skill_id, minimum=minimum, weight=weight)
+
+
+def _compute_experts(
+    requirements: Sequence[Requirement],
+    filters: Mapping[str, int],
+    limit: int,
+    recent_bonus: float,
+    match_all: bool,
+) -> list[dict[str, Any]]:
+    # A single GROUP BY over the entries meeting any requirement. Each
+    # entry scores its requirement's weight times its proficiency, plus
+    # the bonus when used recently, and users are ranked by their total.
+    weight = Case(
+        *(
+            When(skill_id=requirement.skill_id, then=Value(requirement.weight))
+            for requirement in requirements
+        ),
+        output_field=FloatField(),
+    )
+    recent = Case(
+        When(used_in_last_six_months=True, then=Value(recent_bonus)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    breakdown = {}
+    for i, requirement in enumerate(requirements):
+        breakdown[f'proficiency_{i}'] = Max(Case(When(
+            skill_id=requirement.skill_id,
+            then=F('proficiency'),
+        )))
+        breakdown[f'recent_{i}'] = Max(Case(When(
+            skill_id=requirement.skill_id,
+            used_in_last_six_months=True,
+            then=Value(1),
+        ), default=Value(0)))
+    met = Q()
+    for requirement in requirements:
+        met |= Q(
+            skill_id=requirement.skill_id,
+            proficiency__gte=requirement.minimum,
+        )
+    rows = SkillEntry.objects.filter(met, **{
+        f'user__profile__{name}_id': value for name, value in filters.items()
+    }).values('user_id', 'user__email').annotate(
+        matched=Count('id'),
+        score=Sum(weight * (F('proficiency') + recent)),
+        **breakdown,
+    )
+    if match_all:
+        rows = rows.filter(matched=len(requirements))
+    rows = rows.order_by('-score', '-matched', 'user__email')[:limit]
+    experts = []
+    for row in rows:
+        skills = []
+        for i, requirement in enumerate(requirements):
+            proficiency = row[f'proficiency_{i}']
+            if proficiency is None:
+                continue
+            recent_score = recent_bonus if row[f'recent_{i}'] else 0.0
+            skills.append({
+                'skill': requirement.skill_id,
+                'proficiency': proficiency,
+                'used_in_last_six_months': bool(row[f'recent_{i}']),
+                'score': requirement.weight * (proficiency + recent_score),
+            })
+        experts.append({
+            'user': row['user__email'],
+            'score': row['score'],
+            'matched': row['matched'],
+            'skills': skills,
+        })
+    return experts
+
+
+def find_experts(
+    requirements: Sequence[Requirement],
+    filters: Mapping[str, int] | None = None,
+    limit: int = EXPERTS_LIMIT,
+    recent_bonus: float = RECENT_BONUS,
+    match_all: bool = True,
+) -> list[dict[str, Any]]:
+    # Results are cached per query until entries or profiles next change,
+    # or for as long as the replica may lag if read from it.
+    filters = filters or {}
+    if not requirements:
+        return []
+    if len({requirement.skill_id for requirement in requirements}) < len(
+        requirements,
+    ):
+        raise ValueError('Each skill may only be required once.')
+    query = '|'.join([
+        ','.join(
+            f'{r.skill_id}:{r.minimum}:{r.weight}'
+            for r in sorted(requirements, key=lambda r: r.skill_id)
+        ),
+        ','.join(f'{k}={v}' for k, v in sorted(filters.items())),
+        f'{limit}:{recent_bonus}:{match_all}',
+    ])
+    digest = hashlib.md5(query.encode(), usedforsecurity=False).hexdigest()
+    key = generational_key(
+        f'skills:experts:{digest}',
+        ENTRY_GENERATION,
+        PROFILE_GENERATION,
+    )
+    experts = cache.get(key)
+    if experts is None:
+        experts = _compute_experts(
+            requirements,
+            filters,
+            limit,
+            recent_bonus,
+            match_all,
+        )
+        cache.set(key, experts, timeout=replica_timeout(SkillEntry))
+    return experts
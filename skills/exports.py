@@ -0,0 +1,52 @@
+import csv
+import json
+
+from collections.abc import Iterator
+from typing import Any
+
+from .models import SkillEntry
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = {
+    'user': 'user__email',
+    'grade': 'user__profile__grade__name',
+    'unit': 'user__profile__unit__name',
+    'profession': 'user__profile__profession__name',
+    'gender': 'user__profile__gender__name',
+    'skill_id': 'skill_id',
+    'category': 'skill__category__label',
+    'skill': 'skill__name',
+    'proficiency': 'proficiency',
+    'used_in_last_six_months': 'used_in_last_six_months',
+    'last_modified': 'last_modified',
+}
+
+
+class _Echo:
+    def write(self, value: str) -> str:
+        return value
+
+
+def _iter_rows() -> Iterator[tuple[Any, ...]]:
+    # Rows come straight from one joined query, fetched in chunks (through
+    # a server-side cursor where the database supports one), so memory use
+    # does not depend on the size of the table.
+    return SkillEntry.objects.order_by('id').values_list(
+        *EXPORT_FIELDS.values(),
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def iter_csv() -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS.keys())
+    for row in _iter_rows():
+        *values, last_modified = row
+        yield writer.writerow([*values, last_modified.isoformat()])
+
+
+def iter_ndjson() -> Iterator[str]:
+    for row in _iter_rows():
+        record = dict(zip(EXPORT_FIELDS, row))
+        record['last_modified'] = record['last_modified'].isoformat()
+        yield json.dumps(record) + '\n'
@@ -0,0 +1,76 @@
+from typing import Any
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+from django.db import transaction
+
+from skills.models import Skill, SkillCoverage
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = 'Recompute the skill coverage summary from skill entries.'
+
+    def add_arguments(self, parser: CommandParser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help=(
+                'Report differences without changing the summary, failing '
+                'if there are any.'
+            ),
+        )
+
+    def handle(self, *args: Any, **options: Any):
+        stored = {
+            (skill_id, proficiency): (users, recent_users)
+            for skill_id, proficiency, users, recent_users
+            in SkillCoverage.objects.values_list(
+                'skill_id',
+                'proficiency',
+                'user_count',
+                'recent_user_count',
+            )
+        }
+        skill_ids = list(Skill.objects.values_list('id', flat=True))
+        with transaction.atomic():
+            SkillCoverage.objects.exclude(skill_id__in=skill_ids).delete()
+            for i in range(0, len(skill_ids), BATCH_SIZE):
+                SkillCoverage.refresh(skill_ids[i:i + BATCH_SIZE])
+            rebuilt = {
+                (skill_id, proficiency): (users, recent_users)
+                for skill_id, proficiency, users, recent_users
+                in SkillCoverage.objects.values_list(
+                    'skill_id',
+                    'proficiency',
+                    'user_count',
+                    'recent_user_count',
+                )
+            }
+            mismatches = sorted(
+                key for key in stored.keys() | rebuilt.keys()
+                if stored.get(key) != rebuilt.get(key)
+            )
+            for skill_id, proficiency in mismatches:
+                self.stdout.write(
+                    f'Skill #{skill_id} at proficiency {proficiency}: '
+                    f'stored {stored.get((skill_id, proficiency))}, '
+                    f'actual {rebuilt.get((skill_id, proficiency))}'
+                )
+            if options['check']:
+                transaction.set_rollback(True)
+        if options['check'] and mismatches:
+            raise CommandError(
+                f'{len(mismatches)} coverage rows are inconsistent.',
+            )
+        elif options['check']:
+            self.stdout.write(self.style.SUCCESS('Coverage is consistent.'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Rebuilt coverage for {len(skill_ids)} skills, '
+                f'correcting {len(mismatches)} rows.'
+            ))
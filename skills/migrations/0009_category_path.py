@@ -0,0 +1,45 @@
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def populate_paths(apps: Apps, _: BaseDatabaseSchemaEditor):
+    Category = apps.get_model('skills', 'Category')
+    categories = {category.pk: category for category in Category.objects.all()}
+    resolved = {}
+
+    def resolve(category):
+        if category.pk not in resolved:
+            if category.parent_id is None:
+                path, label = f'/{category.pk}/', category.name
+            else:
+                parent_path, parent_label = resolve(categories[category.parent_id])
+                path = f'{parent_path}{category.pk}/'
+                label = f'{parent_label} -> {category.name}'
+            resolved[category.pk] = (path, label)
+        return resolved[category.pk]
+
+    for category in categories.values():
+        category.path, category.label = resolve(category)
+    Category.objects.bulk_update(categories.values(), ['path', 'label'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0008_auto_20250822_1236'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='label',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=1024),
+        ),
+        migrations.RunPython(populate_paths, migrations.RunPython.noop),
+    ]
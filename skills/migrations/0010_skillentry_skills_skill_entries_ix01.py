@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 17:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0009_category_path'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='skillentry',
+            index=models.Index(fields=['-last_modified', '-id'], name='skills_skill_entries_IX01'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+import django.db.models.deletion
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.models import Count, Q
+
+
+def initial_coverage(apps: Apps, _: BaseDatabaseSchemaEditor):
+    Skill = apps.get_model('skills', 'Skill')
+    SkillCoverage = apps.get_model('skills', 'SkillCoverage')
+    SkillEntry = apps.get_model('skills', 'SkillEntry')
+    counts = {
+        (skill_id, proficiency): (0, 0)
+        for skill_id in Skill.objects.values_list('id', flat=True)
+        for proficiency in range(5)
+    }
+    rows = SkillEntry.objects.values_list('skill_id', 'proficiency').annotate(
+        users=Count('id'),
+        recent_users=Count('id', filter=Q(used_in_last_six_months=True)),
+    ).order_by()
+    for skill_id, proficiency, users, recent_users in rows:
+        counts[(skill_id, proficiency)] = (users, recent_users)
+    SkillCoverage.objects.bulk_create(
+        SkillCoverage(
+            skill_id=skill_id,
+            proficiency=proficiency,
+            user_count=users,
+            recent_user_count=recent_users,
+        )
+        for (skill_id, proficiency), (users, recent_users) in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0010_skillentry_skills_skill_entries_ix01'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillCoverage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('proficiency', models.SmallIntegerField(choices=[(0, 'No knowledge or experience'), (1, 'Knowledge but no experience'), (2, 'Limited experience'), (3, 'Moderate experience'), (4, 'Good experience')])),
+                ('user_count', models.IntegerField(default=0)),
+                ('recent_user_count', models.IntegerField(default=0)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='coverage', to='skills.skill')),
+            ],
+            options={
+                'db_table': 'skills_skill_coverage',
+                'constraints': [models.UniqueConstraint(fields=('skill', 'proficiency'), name='skills_skill_coverage_AK01')],
+            },
+        ),
+        migrations.RunPython(initial_coverage, migrations.RunPython.noop),
+    ]
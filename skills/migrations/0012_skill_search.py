@@ -0,0 +1,97 @@
+from django.apps.registry import Apps
+from django.db import migrations
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.utils import OperationalError
+
+# The index is only built on SQLite builds with FTS5's trigram tokenizer.
+# Elsewhere, skills.search falls back to ordinary queries.
+STATEMENTS = (
+    """
+    CREATE VIRTUAL TABLE skills_skill_search
+    USING fts5(name, label, tokenize='trigram')
+    """,
+    """
+    INSERT INTO skills_skill_search (rowid, name, label)
+    SELECT s.id, s.name, c.label
+    FROM skills_skills s
+    INNER JOIN skills_categories c ON c.id = s.category_id
+    """,
+    """
+    CREATE TRIGGER skills_skill_search_ai AFTER INSERT ON skills_skills BEGIN
+        INSERT INTO skills_skill_search (rowid, name, label)
+        SELECT new.id, new.name, label
+        FROM skills_categories WHERE id = new.category_id;
+    END
+    """,
+    """
+    CREATE TRIGGER skills_skill_search_ad AFTER DELETE ON skills_skills BEGIN
+        DELETE FROM skills_skill_search WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER skills_skill_search_au
+    AFTER UPDATE OF name, category_id ON skills_skills BEGIN
+        DELETE FROM skills_skill_search WHERE rowid = old.id;
+        INSERT INTO skills_skill_search (rowid, name, label)
+        SELECT new.id, new.name, label
+        FROM skills_categories WHERE id = new.category_id;
+    END
+    """,
+    """
+    CREATE TRIGGER skills_skill_search_cu
+    AFTER UPDATE OF label ON skills_categories BEGIN
+        DELETE FROM skills_skill_search WHERE rowid IN (
+            SELECT id FROM skills_skills WHERE category_id = new.id
+        );
+        INSERT INTO skills_skill_search (rowid, name, label)
+        SELECT id, name, new.label
+        FROM skills_skills WHERE category_id = new.id;
+    END
+    """,
+)
+
+TRIGGERS = ('ai', 'ad', 'au', 'cu')
+
+
+def _supported(connection: BaseDatabaseWrapper) -> bool:
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                "CREATE VIRTUAL TABLE temp.fts5_check "
+                "USING fts5(x, tokenize='trigram')",
+            )
+        except OperationalError:
+            return False
+        cursor.execute('DROP TABLE temp.fts5_check')
+    return True
+
+
+def create_search_index(apps: Apps, schema_editor: BaseDatabaseSchemaEditor):
+    if not _supported(schema_editor.connection):
+        return
+    for statement in STATEMENTS:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps: Apps, schema_editor: BaseDatabaseSchemaEditor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for trigger in TRIGGERS:
+        schema_editor.execute(
+            f'DROP TRIGGER IF EXISTS skills_skill_search_{trigger}',
+        )
+    schema_editor.execute('DROP TABLE IF EXISTS skills_skill_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0011_skillcoverage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
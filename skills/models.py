@@ -1,50 +1,115 @@
-import functools
-
-from collections.abc import Mapping
+from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Any
 
-from django import forms
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Concat, Substr
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from core.caching import GenerationalQuerySet, bump_generation, get_or_build
+
+TAXONOMY_GENERATION = 'skills.taxonomy'
+ENTRY_GENERATION = 'skills.entries'
+ENTRY_REMOVAL_GENERATION = 'skills.entries.removed'
+
 
 @dataclass
 class _SkillTreeNode:
+    id: int | None
     name: str
-    skills: models.QuerySet['Skill'] | list['Skill']
+    skills: list['Skill']
     has_skills: bool
     subnodes: list['_SkillTreeNode']
-    entry_forms: dict[str, forms.Form]
-
-    def add_forms(self, mapping: Mapping[int, forms.Form]):
-        for skill in self.skills:
-            self.entry_forms[skill.name] = mapping[skill.id]
-        for subnode in self.subnodes:
-            subnode.add_forms(mapping)
-
-
-@functools.cache
-def _make_tree_node(category: 'Category') -> _SkillTreeNode:
-    node = _SkillTreeNode(
-        name=category.name,
-        skills=category.skills.order_by('name'),
-        has_skills=category.skills.exists(),
-        subnodes=[],
-        entry_forms={},
+
+
+def _make_tree_nodes() -> list[_SkillTreeNode]:
+    # The whole taxonomy is loaded in two flat queries and assembled in
+    # memory from the parent_id adjacency list.
+    children: defaultdict[int | None, list[Category]] = defaultdict(list)
+    for category in Category.objects.order_by('name'):
+        children[category.parent_id].append(category)
+    skills: defaultdict[int, list[Skill]] = defaultdict(list)
+    for skill in Skill.objects.order_by('name'):
+        skills[skill.category_id].append(skill)
+
+    def make_node(category: Category) -> _SkillTreeNode:
+        node = _SkillTreeNode(
+            id=category.id,
+            name=category.name,
+            skills=skills[category.id],
+            has_skills=bool(skills[category.id]),
+            subnodes=[],
+        )
+        for subcategory in children[category.id]:
+            subnode = make_node(subcategory)
+            if subnode.has_skills:
+                node.has_skills = True
+                node.subnodes.append(subnode)
+        return node
+
+    return [make_node(category) for category in children[None]]
+
+
+def _get_tree_nodes() -> list[_SkillTreeNode]:
+    return get_or_build(
+        'skills:tree',
+        (TAXONOMY_GENERATION,),
+        _make_tree_nodes,
     )
-    for subcategory in category.children.order_by('name'):
-        subnode = _make_tree_node(subcategory)
-        if subnode.has_skills:
-            node.has_skills = True
-            node.subnodes.append(subnode)
-    return node
+
+
+class _TaxonomyQuerySet(GenerationalQuerySet):
+    generations = (TAXONOMY_GENERATION,)
+
+
+# Moving an entry to another user or skill removes it from where it was.
+_ENTRY_OWNERS = ('user', 'user_id', 'skill', 'skill_id')
+
+
+class _SkillEntryQuerySet(GenerationalQuerySet):
+    # Bulk writes also refresh the coverage summary of every skill they
+    # touch, in the same transaction.
+    generations = (ENTRY_GENERATION,)
+
+    def update(self, **kwargs: Any) -> int:
+        # auto_now is only applied by save(), and incremental readers find
+        # changes by their last_modified timestamps.
+        kwargs.setdefault('last_modified', timezone.now())
+        with transaction.atomic():
+            skill_ids = set(self.values_list('skill_id', flat=True))
+            rows = super().update(**kwargs)
+            skill = kwargs.get('skill_id', kwargs.get('skill'))
+            if skill is not None:
+                skill_ids.add(getattr(skill, 'pk', skill))
+            SkillCoverage.refresh(skill_ids)
+            if kwargs.keys() & set(_ENTRY_OWNERS):
+                bump_generation(ENTRY_REMOVAL_GENERATION)
+        return rows
+
+    def bulk_create(self, objs: Iterable[Any], *args: Any, **kwargs: Any):
+        objs = list(objs)
+        with transaction.atomic():
+            created = super().bulk_create(objs, *args, **kwargs)
+            SkillCoverage.refresh({obj.skill_id for obj in objs})
+        return created
+
+
+def subtree_filter(path: str, field: str = 'path') -> Q:
+    # Matches the paths starting with the given one. Paths hold only
+    # digits and slashes, and '0' sorts right after '/', so these are
+    # exactly the paths in a range, which, unlike LIKE, can be read from
+    # the index. This relies on binary collation, as SQLite uses.
+    return Q(**{f'{field}__gte': path, f'{field}__lt': f'{path[:-1]}0'})
 
 
 class Category(models.Model):
     id: models.BigAutoField
+    parent_id: int | None
     skills: models.QuerySet['Skill']
     children: models.QuerySet['Category']
     name = models.CharField(max_length=255)
@@ -55,42 +120,87 @@ class Category(models.Model):
         blank=True,
         null=True,
     )
+    # The materialised path lists the ids from the root down to and
+    # including this category, e.g. '/1/4/9/', and the label holds the
+    # matching names joined with ' -> '. Both are maintained by save().
+    path = models.CharField(
+        max_length=1024,
+        blank=True,
+        default='',
+        editable=False,
+        db_index=True,
+    )
+    label = models.TextField(blank=True, default='', editable=False)
+    objects = _TaxonomyQuerySet.as_manager()
 
-    @classmethod
-    def make_tree(cls, mapping: Mapping[int, forms.Form]) -> _SkillTreeNode:
-        top_level = cls.objects.filter(parent=None).order_by('name')
-        top_nodes = [_make_tree_node(category) for category in top_level]
-        root = _SkillTreeNode(
-            name='Root',
-            skills=[],
-            has_skills=any([node.has_skills for node in top_nodes]),
-            subnodes=top_nodes,
-            entry_forms={},
-        )
-        root.add_forms(mapping)
-        return root
+    @property
+    def ancestor_ids(self) -> list[int]:
+        return [int(pk) for pk in self.path.strip('/').split('/')[:-1]]
+
+    def ancestors(self) -> models.QuerySet['Category']:
+        return Category.objects.filter(pk__in=self.ancestor_ids)
+
+    def subtree(self) -> models.QuerySet['Category']:
+        return Category.objects.filter(subtree_filter(self.path))
 
     def clean(self):
-        ancestor = self.parent
-        while ancestor is not None:
-            if ancestor.id == self.id:
-                raise ValidationError('Loop detected in parent chain.')
-            ancestor = ancestor.parent
+        if self.pk is None or self.parent_id is None:
+            return
+        parent_path = Category.objects.filter(
+            pk=self.parent_id,
+        ).values_list('path', flat=True).first()
+        if self.parent_id == self.pk or f'/{self.pk}/' in (parent_path or ''):
+            raise ValidationError('Loop detected in parent chain.')
 
     def save(self, *args: Any, **kwargs: Any):
         self.full_clean()
-        _make_tree_node.cache_clear()
-        return super().save(*args, **kwargs)
+        with transaction.atomic():
+            # The stored prefixes are read first so that a stale instance
+            # cannot write outdated values back over them.
+            stored = None
+            if self.pk is not None:
+                stored = Category.objects.filter(
+                    pk=self.pk,
+                ).values_list('path', 'label').first()
+            self.path, self.label = stored or ('', '')
+            super().save(*args, **kwargs)
+            self._update_path()
 
-    def delete(self, *args: Any, **kwargs: Any):
-        _make_tree_node.cache_clear()
-        return super().delete(*args, **kwargs)
+    def _update_path(self):
+        if self.parent_id is None:
+            path, label = f'/{self.pk}/', self.name
+        else:
+            parent_path, parent_label = Category.objects.filter(
+                pk=self.parent_id,
+            ).values_list('path', 'label').get()
+            path = f'{parent_path}{self.pk}/'
+            label = f'{parent_label} -> {self.name}'
+        old_path, old_label = self.path, self.label
+        if (path, label) == (old_path, old_label):
+            return
+        self.path, self.label = path, label
+        Category.objects.filter(pk=self.pk).update(path=path, label=label)
+        if not old_path:
+            return
+        # Every descendant shares the old prefixes, so moving or renaming a
+        # category rewrites its whole subtree in a single statement.
+        Category.objects.filter(
+            subtree_filter(old_path),
+        ).exclude(pk=self.pk).update(
+            path=Concat(
+                Value(path),
+                Substr('path', len(old_path) + 1),
+                output_field=models.CharField(),
+            ),
+            label=Concat(
+                Value(label),
+                Substr('label', len(old_label) + 1),
+                output_field=models.TextField(),
+            ),
+        )
 
     def __str__(self):
-        if self.parent is not None:
-            return f'{str(self.parent)} -> {self.name}'
-        else:
-            return self.name
+        return self.label or self.name
 
     class Meta:
         db_table = 'skills_categories'
@@ -104,19 +214,17 @@ class Category(models.Model):
 
 class Skill(models.Model):
     id: models.BigAutoField
+    category_id: int
     name = models.CharField(max_length=255)
     category = models.ForeignKey(
         to=Category,
         on_delete=models.PROTECT,
         related_name='skills',
     )
-
-    def save(self, *args: Any, **kwargs: Any):
-        _make_tree_node.cache_clear()
-        return super().save(*args, **kwargs)
+    objects = _TaxonomyQuerySet.as_manager()
 
     def __str__(self):
-        return f'{str(self.category)} -> {self.name}'
+        return f'{self.category.label} -> {self.name}'
 
     class Meta:
         db_table = 'skills_skills'
@@ -137,6 +245,8 @@ class SkillEntry(models.Model):
         GOOD_EXPERIENCE = 4, _('Good experience')
 
     id: models.BigAutoField
+    user_id: int
+    skill_id: int
     user = models.ForeignKey(
         to=get_user_model(),
         on_delete=models.CASCADE,
@@ -152,15 +262,186 @@ class SkillEntry(models.Model):
     )
     used_in_last_six_months = models.BooleanField()
     last_modified = models.DateTimeField(auto_now=True)
+    objects = _SkillEntryQuerySet.as_manager()
+
+    @classmethod
+    def bulk_upsert(
+        cls,
+        rows: Iterable[tuple[int, int, int, bool]],
+    ) -> list['SkillEntry']:
+        # Rows are (user_id, skill_id, proficiency, used_in_last_six_months).
+        # Rows matching what is already stored are dropped so that their
+        # last_modified timestamps are left untouched.
+        pending = {
+            (user_id, skill_id): (proficiency, used_recently)
+            for user_id, skill_id, proficiency, used_recently in rows
+        }
+        if not pending:
+            return []
+        with transaction.atomic():
+            existing = cls.objects.filter(
+                user_id__in={user_id for user_id, _ in pending},
+                skill_id__in={skill_id for _, skill_id in pending},
+            ).values_list(
+                'user_id',
+                'skill_id',
+                'proficiency',
+                'used_in_last_six_months',
+            )
+            for user_id, skill_id, proficiency, used_recently in existing:
+                key = (user_id, skill_id)
+                if pending.get(key) == (proficiency, used_recently):
+                    del pending[key]
+            entries = [
+                cls(
+                    user_id=user_id,
+                    skill_id=skill_id,
+                    proficiency=proficiency,
+                    used_in_last_six_months=used_recently,
+                )
+                for (user_id, skill_id), (proficiency, used_recently)
+                in pending.items()
+            ]
+            return cls.objects.bulk_create(
+                entries,
+                update_conflicts=True,
+                unique_fields=['user', 'skill'],
+                update_fields=[
+                    'proficiency',
+                    'used_in_last_six_months',
+                    'last_modified',
+                ],
+            )
+
+    def save(self, *args: Any, **kwargs: Any):
+        with transaction.atomic():
+            stored = None
+            if self.pk is not None:
+                stored = SkillEntry.objects.filter(pk=self.pk).values_list(
+                    'user_id',
+                    'skill_id',
+                    'proficiency',
+                    'used_in_last_six_months',
+                ).first()
+            previous = stored[1:] if stored else None
+            super().save(*args, **kwargs)
+            if stored and stored[:2] != (self.user_id, self.skill_id):
+                bump_generation(ENTRY_REMOVAL_GENERATION)
+            current = (
+                self.skill_id,
+                self.proficiency,
+                self.used_in_last_six_months,
+            )
+            if previous != current:
+                adjusted = (
+                    previous is None or SkillCoverage.adjust(*previous, -1)
+                ) and SkillCoverage.adjust(*current, 1)
+                if not adjusted:
+                    # A missing bucket means the summary is incomplete, so
+                    # it is recounted instead, which includes this entry.
+                    SkillCoverage.refresh({
+                        self.skill_id,
+                        *(previous[:1] if previous else ()),
+                    })
 
     def __str__(self):
         return f'Entry #{self.id}'
 
     class Meta:
         db_table = 'skills_skill_entries'
+        indexes = [
+            models.Index(
+                fields=['-last_modified', '-id'],
+                name='skills_skill_entries_IX01',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['user', 'skill'],
                 name='skills_skill_entries_AK01',
             ),
         ]
+
+
+class SkillCoverage(models.Model):
+    # A summary of entries per (skill, proficiency), maintained alongside
+    # every write to SkillEntry. The rebuild_skill_coverage command
+    # recomputes it from scratch.
+    skill_id: int
+    skill = models.ForeignKey(
+        to=Skill,
+        on_delete=models.CASCADE,
+        related_name='coverage',
+    )
+    proficiency = models.SmallIntegerField(
+        choices=SkillEntry.Proficiency.choices,
+    )
+    user_count = models.IntegerField(default=0)
+    recent_user_count = models.IntegerField(default=0)
+
+    @classmethod
+    def adjust(
+        cls,
+        skill_id: int,
+        proficiency: int,
+        used_recently: bool,
+        delta: int,
+    ) -> bool:
+        # Returns False, having changed nothing, if the bucket has no row
+        # yet. The caller then refreshes the skill, as the summary for it
+        # is incomplete.
+        updated = cls.objects.filter(
+            skill_id=skill_id,
+            proficiency=proficiency,
+        ).update(
+            user_count=F('user_count') + delta,
+            recent_user_count=(
+                F('recent_user_count') + (delta if used_recently else 0)
+            ),
+        )
+        return bool(updated)
+
+    @classmethod
+    def refresh(cls, skill_ids: Iterable[int]):
+        counts = {
+            (skill_id, proficiency): (0, 0)
+            for skill_id in set(skill_ids)
+            for proficiency in SkillEntry.Proficiency.values
+        }
+        if not counts:
+            return
+        rows = SkillEntry.objects.filter(
+            skill_id__in={skill_id for skill_id, _ in counts},
+        ).values_list('skill_id', 'proficiency').annotate(
+            users=Count('id'),
+            recent_users=Count('id', filter=Q(used_in_last_six_months=True)),
+        ).order_by()
+        for skill_id, proficiency, users, recent_users in rows:
+            counts[(skill_id, proficiency)] = (users, recent_users)
+        cls.objects.bulk_create(
+            [
+                cls(
+                    skill_id=skill_id,
+                    proficiency=proficiency,
+                    user_count=users,
+                    recent_user_count=recent_users,
+                )
+                for (skill_id, proficiency), (users, recent_users)
+                in counts.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['skill', 'proficiency'],
+            update_fields=['user_count', 'recent_user_count'],
+        )
+
+    def __str__(self):
+        return f'Coverage of skill #{self.skill_id} at {self.proficiency}'
+
+    class Meta:
+        db_table = 'skills_skill_coverage'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['skill', 'proficiency'],
+                name='skills_skill_coverage_AK01',
+            ),
+        ]
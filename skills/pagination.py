@@ -0,0 +1,52 @@
+import base64
+import binascii
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from django.db import models
+from django.db.models import Q
+
+
+@dataclass
+class KeysetPage:
+    items: list[Any]
+    next_cursor: str | None
+
+
+def encode_cursor(last_modified: datetime, pk: int) -> str:
+    raw = f'{last_modified.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        last_modified, pk = raw.split('|')
+        return datetime.fromisoformat(last_modified), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError('Invalid cursor.')
+
+
+def paginate_by_last_modified(
+    queryset: models.QuerySet[Any],
+    cursor: str | None,
+    size: int,
+) -> KeysetPage:
+    # Pages are walked newest first along (last_modified, id), which the
+    # composite index on skill entries serves directly. Unlike offsets, the
+    # cost of a page does not grow with how far into the table it is.
+    queryset = queryset.order_by('-last_modified', '-id')
+    if cursor:
+        last_modified, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(last_modified__lt=last_modified) | Q(id__lt=pk),
+            last_modified__lte=last_modified,
+        )
+    items = list(queryset[:size + 1])
+    next_cursor = None
+    if len(items) > size:
+        items = items[:size]
+        next_cursor = encode_cursor(items[-1].last_modified, items[-1].pk)
+    return KeysetPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,180 @@
+import bisect
+import time
+
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.core.cache import cache
+
+from core.caching import get_generation, generational_key
+from core.routers import replica_timeout
+from users.models import PROFILE_GENERATION
+
+from .models import (
+    ENTRY_GENERATION,
+    ENTRY_REMOVAL_GENERATION,
+    TAXONOMY_GENERATION,
+    SkillEntry,
+    _get_tree_nodes,
+    _SkillTreeNode,
+)
+
+PIVOT_FILTERS = ('gender', 'grade', 'profession', 'unit')
+
+# Entries are picked up by their last_modified timestamps, which are set
+# before the writing transaction commits. Rereading a short window before
+# the watermark catches rows that committed out of order.
+PIVOT_WATERMARK_SLACK = timedelta(seconds=60)
+
+PivotRow = tuple[int, str, int, int, datetime]
+
+_EMPTY = -1
+
+
+@dataclass
+class PivotColumn:
+    skill_id: int
+    name: str
+
+
+@dataclass
+class PivotGroup:
+    label: str
+    span: int
+
+
+@dataclass
+class Pivot:
+    columns: list[PivotColumn]
+    groups: list[PivotGroup]
+    emails: list[str] = field(default_factory=list)
+    user_ids: list[int] = field(default_factory=list)
+    # array is only subscriptable for type checkers.
+    cells: 'array[int]' = field(default_factory=lambda: array('b'))
+    watermark: datetime | None = None
+    entry_generation: int | None = None
+    expires: float | None = None
+
+    def rows(self) -> Iterator[tuple[str, list[int | None]]]:
+        width = len(self.columns)
+        for i, email in enumerate(self.emails):
+            row = self.cells[i * width:(i + 1) * width]
+            yield email, [None if cell == _EMPTY else cell for cell in row]
+
+    def fill(self, rows: list[PivotRow]):
+        users = sorted({(email, user_id) for user_id, email, *_ in rows})
+        self.emails = [email for email, _ in users]
+        self.user_ids = [user_id for _, user_id in users]
+        self.cells = array('b', [_EMPTY]) * (len(users) * len(self.columns))
+        self.apply(rows)
+
+    def apply(self, rows: list[PivotRow]):
+        # Rows are (user_id, email, skill_id, proficiency, last_modified).
+        # Users not seen before get a new empty row, kept in email order.
+        width = len(self.columns)
+        column_index = {col.skill_id: i for i, col in enumerate(self.columns)}
+        row_index = {user_id: i for i, user_id in enumerate(self.user_ids)}
+        for user_id, email, skill_id, proficiency, last_modified in rows:
+            if self.watermark is None or last_modified > self.watermark:
+                self.watermark = last_modified
+            column = column_index.get(skill_id)
+            if column is None:
+                continue
+            row = row_index.get(user_id)
+            if row is None:
+                row = bisect.bisect(self.emails, email)
+                self.emails.insert(row, email)
+                self.user_ids.insert(row, user_id)
+                self.cells[row * width:row * width] = array(
+                    'b',
+                    [_EMPTY] * width,
+                )
+                row_index = {pk: i for i, pk in enumerate(self.user_ids)}
+            self.cells[row * width + column] = proficiency
+
+
+def _make_columns() -> tuple[list[PivotColumn], list[PivotGroup]]:
+    # Columns follow the order of the category tree on the overview page,
+    # with one group for each category that holds skills directly.
+    columns: list[PivotColumn] = []
+    groups: list[PivotGroup] = []
+
+    def walk(node: _SkillTreeNode, label: str):
+        for subnode in node.subnodes:
+            walk(subnode, f'{label} -> {subnode.name}')
+        if node.skills:
+            groups.append(PivotGroup(label=label, span=len(node.skills)))
+            columns.extend(
+                PivotColumn(skill_id=skill.id, name=skill.name)
+                for skill in node.skills
+            )
+
+    for node in _get_tree_nodes():
+        if node.has_skills:
+            walk(node, node.name)
+    return columns, groups
+
+
+def _query(
+    filters: Mapping[str, int],
+    since: datetime | None = None,
+) -> Iterable[PivotRow]:
+    entries = SkillEntry.objects.filter(**{
+        f'user__profile__{name}_id': value for name, value in filters.items()
+    })
+    if since is not None:
+        entries = entries.filter(last_modified__gte=since)
+    return entries.values_list(
+        'user_id',
+        'user__email',
+        'skill_id',
+        'proficiency',
+        'last_modified',
+    )
+
+
+def get_pivot(filters: Mapping[str, int]) -> Pivot:
+    # Each filter set is cached separately. Columns depend on the taxonomy
+    # and rows on profiles, so changes to either start a new pivot, as do
+    # deletions. Other entry writes are applied to the cached pivot with a
+    # query over recently modified entries only. Once a pivot has read
+    # from the replica, it is rebuilt when the replica may have caught up
+    # with writes it was missing.
+    filter_key = ','.join(f'{k}={v}' for k, v in sorted(filters.items()))
+    key = generational_key(
+        f'skills:pivot:{filter_key}',
+        TAXONOMY_GENERATION,
+        ENTRY_REMOVAL_GENERATION,
+        PROFILE_GENERATION,
+    )
+    entry_generation = get_generation(ENTRY_GENERATION)
+    pivot: Pivot | None = cache.get(key)
+    if pivot is not None and (pivot.expires or float('inf')) <= time.time():
+        pivot = None
+    if pivot is not None and pivot.entry_generation == entry_generation:
+        return pivot
+    if pivot is None or pivot.watermark is None:
+        columns, groups = _make_columns()
+        pivot = Pivot(columns=columns, groups=groups)
+        pivot.fill(list(_query(filters)))
+    else:
+        since = pivot.watermark - PIVOT_WATERMARK_SLACK
+        pivot.apply(list(_query(filters, since)))
+    timeout = replica_timeout(SkillEntry)
+    if timeout is not None and pivot.expires is None:
+        pivot.expires = time.time() + timeout
+    pivot.entry_generation = entry_generation
+    cache.set(key, pivot, timeout=None)
+    return pivot
+
+
+def parse_filters(params: Mapping[str, Any]) -> dict[str, int]:
+    filters: dict[str, int] = {}
+    for name in PIVOT_FILTERS:
+        value = params.get(name)
+        if value:
+            filters[name] = int(value)
+    return filters
@@ -0,0 +1,166 @@
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from django.db import connections, router
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Q, Sum
+from django.db.utils import OperationalError
+
+from .models import Skill, SkillCoverage, SkillEntry
+
+SEARCH_LIMIT = 20
+
+# Fuzzy matches must share at least this fraction of their trigrams with
+# the query.
+FUZZY_THRESHOLD = 0.3
+
+# On SQLite, skills are indexed by name and category label in an FTS5
+# table with the trigram tokenizer, which matches any substring of three
+# or more characters. Triggers keep it in step with every insert, update
+# and delete, including bulk writes and the subtree updates made when a
+# category moves or is renamed.
+SEARCH_TABLE = 'skills_skill_search'
+
+
+@dataclass
+class SkillHit:
+    id: int
+    name: str
+    category: str
+    people: int = 0
+
+
+@dataclass
+class Expert:
+    email: str
+    proficiency: int
+    used_recently: bool
+
+    @property
+    def proficiency_label(self) -> str:
+        return SkillEntry.Proficiency(self.proficiency).label
+
+
+def _trigrams(text: str) -> set[str]:
+    return {
+        word[i:i + 3]
+        for word in text.lower().split()
+        for i in range(len(word) - 2)
+    }
+
+
+def _quote(term: str) -> str:
+    return '"{}"'.format(term.replace('"', '""'))
+
+
+def _match(
+    connection: BaseDatabaseWrapper,
+    expression: str,
+    limit: int,
+) -> list[tuple[int, str, str]]:
+    # Names weigh ten times as much as category labels in the ranking.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid, name, label FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s '
+            f'ORDER BY bm25({SEARCH_TABLE}, 10.0, 1.0) LIMIT %s',
+            [expression, limit],
+        )
+        return cursor.fetchall()
+
+
+def _search_index(
+    connection: BaseDatabaseWrapper,
+    terms: str,
+    limit: int,
+) -> Iterator[tuple[int, str, str]]:
+    # Substring matches come first, names starting with the query ahead
+    # of the rest. Any remaining places go to fuzzy matches, found by
+    # looking for any of the query's trigrams and keeping the candidates
+    # that share enough of them.
+    exact = _match(connection, _quote(terms), limit)
+    exact.sort(key=lambda row: not row[1].lower().startswith(terms.lower()))
+    yield from exact
+    if len(exact) >= limit:
+        return
+    trigrams = _trigrams(terms)
+    if not trigrams:
+        return
+    seen = {row[0] for row in exact}
+    candidates = _match(
+        connection,
+        ' OR '.join(map(_quote, sorted(trigrams))),
+        limit * 5,
+    )
+    scored = []
+    for row in candidates:
+        if row[0] in seen:
+            continue
+        shared = len(trigrams & _trigrams(row[1]))
+        score = shared / len(trigrams | _trigrams(row[1]))
+        if score >= FUZZY_THRESHOLD:
+            scored.append((score, row))
+    scored.sort(key=lambda item: -item[0])
+    yield from (row for _, row in scored[:limit - len(exact)])
+
+
+def _search_orm(terms: str, limit: int) -> Iterator[tuple[int, str, str]]:
+    # Used for queries too short for trigrams, and on databases without
+    # the index.
+    if len(terms) < 3:
+        condition = Q(name__istartswith=terms)
+    else:
+        condition = Q(name__icontains=terms) | Q(
+            category__label__icontains=terms,
+        )
+    return iter(Skill.objects.filter(condition).order_by('name').values_list(
+        'id',
+        'name',
+        'category__label',
+    )[:limit])
+
+
+def search_skills(query: str, limit: int = SEARCH_LIMIT) -> list[SkillHit]:
+    terms = ' '.join(query.split())
+    if not terms:
+        return []
+    connection = connections[router.db_for_read(Skill)]
+    rows = None
+    if len(terms) >= 3 and connection.vendor == 'sqlite':
+        try:
+            rows = list(_search_index(connection, terms, limit))
+        except OperationalError:
+            # The index is missing where SQLite lacks FTS5 trigrams.
+            rows = None
+    if rows is None:
+        rows = list(_search_orm(terms, limit))
+    hits = [
+        SkillHit(id=skill_id, name=name, category=label)
+        for skill_id, name, label in rows
+    ]
+    people = dict(SkillCoverage.objects.filter(
+        skill_id__in=[hit.id for hit in hits],
+        proficiency__gt=SkillEntry.Proficiency.NONE,
+    ).values_list('skill_id').annotate(Sum('user_count')).order_by())
+    for hit in hits:
+        hit.people = people.get(hit.id, 0)
+    return hits
+
+
+def find_people(skill_id: int, limit: int = 100) -> list[Expert]:
+    # Everyone with some experience of the skill, most proficient first.
+    return [
+        Expert(email=email, proficiency=proficiency, used_recently=used)
+        for email, proficiency, used in SkillEntry.objects.filter(
+            skill_id=skill_id,
+            proficiency__gt=SkillEntry.Proficiency.NONE,
+        ).order_by(
+            '-proficiency',
+            '-used_in_last_six_months',
+            'user__email',
+        ).values_list(
+            'user__email',
+            'proficiency',
+            'used_in_last_six_months',
+        )[:limit]
+    ]
@@ -0,0 +1,43 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.caching import bump_generation
+
+from .models import (
+    ENTRY_GENERATION,
+    ENTRY_REMOVAL_GENERATION,
+    TAXONOMY_GENERATION,
+    Category,
+    Skill,
+    SkillCoverage,
+    SkillEntry,
+)
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Skill)
+def taxonomy_changed(**kwargs: Any):
+    bump_generation(TAXONOMY_GENERATION)
+
+
+@receiver(post_save, sender=SkillEntry)
+def entry_saved(**kwargs: Any):
+    bump_generation(ENTRY_GENERATION)
+
+
+@receiver(post_delete, sender=SkillEntry)
+def entry_deleted(instance: SkillEntry, **kwargs: Any):
+    # Deletions run inside the collector's transaction, so the summary is
+    # adjusted atomically with the delete, including cascades from users.
+    adjusted = SkillCoverage.adjust(
+        instance.skill_id,
+        instance.proficiency,
+        instance.used_in_last_six_months,
+        -1,
+    )
+    if not adjusted:
+        SkillCoverage.refresh([instance.skill_id])
+    bump_generation(ENTRY_GENERATION)
+    bump_generation(ENTRY_REMOVAL_GENERATION)
@@ -0,0 +1,120 @@
+import re
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from core.caching import get_or_build
+
+from .models import (
+    TAXONOMY_GENERATION,
+    SkillEntry,
+    _get_tree_nodes,
+    _SkillTreeNode,
+)
+
+# Slots mark where a user's own state goes in otherwise shared markup:
+# \x00p:<skill id>:<value>\x00 for a proficiency radio button and
+# \x00u:<skill id>\x00 for the recently used checkbox.
+_SLOT = re.compile('\x00([pu]):(\\d+)(?::(\\d+))?\x00')
+
+
+@dataclass
+class _SkeletonSkill:
+    id: int
+    name: str
+    choices: list[tuple[int, str, str]]
+    used_slot: str
+
+
+@dataclass
+class _SkeletonNode:
+    name: str
+    subnodes: list['_SkeletonNode']
+    skills: list[_SkeletonSkill]
+
+
+@dataclass
+class Skeleton:
+    parts: list[str]
+    slots: list[tuple[str, int, int | None]]
+
+    def render(self, entries: Mapping[int, tuple[int, bool]]) -> SafeString:
+        # Only the checked state of each input depends on the user, so the
+        # cached markup is stitched back together around their entries.
+        output = [self.parts[0]]
+        for (kind, skill_id, value), part in zip(self.slots, self.parts[1:]):
+            entry = entries.get(skill_id)
+            if entry is not None:
+                proficiency, used_recently = entry
+                if kind == 'p' and proficiency == value:
+                    output.append(' checked')
+                elif kind == 'u' and used_recently:
+                    output.append(' checked')
+            output.append(part)
+        return mark_safe(''.join(output))
+
+
+def _find_node(
+    nodes: list[_SkillTreeNode],
+    category_id: int,
+) -> _SkillTreeNode | None:
+    for node in nodes:
+        if node.id == category_id:
+            return node
+        found = _find_node(node.subnodes, category_id)
+        if found is not None:
+            return found
+    return None
+
+
+def _make_skeleton(category_id: int) -> Skeleton:
+    def make_node(node: _SkillTreeNode) -> _SkeletonNode:
+        return _SkeletonNode(
+            name=node.name,
+            subnodes=[make_node(subnode) for subnode in node.subnodes],
+            skills=[
+                _SkeletonSkill(
+                    id=skill.id,
+                    name=skill.name,
+                    choices=[
+                        (value, label, f'\x00p:{skill.id}:{value}\x00')
+                        for value, label in SkillEntry.Proficiency.choices
+                    ],
+                    used_slot=f'\x00u:{skill.id}\x00',
+                )
+                for skill in node.skills
+            ],
+        )
+
+    node = _find_node(_get_tree_nodes(), category_id)
+    nodes = [] if node is None or not node.has_skills else [make_node(node)]
+    markup = render_to_string('skills/skeleton.html', {'nodes': nodes})
+    pieces = _SLOT.split(markup)
+    return Skeleton(
+        parts=pieces[::4],
+        slots=[
+            (kind, int(skill_id), None if value is None else int(value))
+            for kind, skill_id, value in zip(
+                pieces[1::4],
+                pieces[2::4],
+                pieces[3::4],
+            )
+        ],
+    )
+
+
+def get_skeleton(category_id: int) -> Skeleton:
+    # Each category's subtree is rendered and cached separately, so the
+    # overview only pays for the categories a user actually opens.
+    return get_or_build(
+        f'skills:skeleton:{category_id}',
+        (TAXONOMY_GENERATION,),
+        lambda: _make_skeleton(category_id),
+    )
+
+
+def get_top_level_nodes() -> list[_SkillTreeNode]:
+    return [node for node in _get_tree_nodes() if node.has_skills]
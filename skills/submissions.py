@@ -0,0 +1,56 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from core.caching import get_or_build
+
+from .models import TAXONOMY_GENERATION, Skill, SkillEntry
+
+# Submissions carry one p<skill id> field per rated skill holding the
+# proficiency value, plus a u<skill id> field for each skill used in the
+# last six months.
+_PROFICIENCIES = {str(value): value for value in SkillEntry.Proficiency.values}
+
+
+@dataclass
+class Submission:
+    entries: dict[int, tuple[int, bool]] = field(default_factory=dict)
+    errors: dict[int, str] = field(default_factory=dict)
+
+
+def get_skill_ids() -> frozenset[int]:
+    return get_or_build(
+        'skills:skill-ids',
+        (TAXONOMY_GENERATION,),
+        lambda: frozenset(Skill.objects.values_list('id', flat=True)),
+    )
+
+
+def parse_submission(data: Mapping[str, str]) -> Submission:
+    # A single pass over the submitted fields, checking each value with a
+    # dictionary lookup and each skill with a set lookup.
+    skill_ids = get_skill_ids()
+    submission = Submission()
+    proficiencies: dict[int, int] = {}
+    used_recently: set[int] = set()
+    for key, value in data.items():
+        kind, raw_id = key[:1], key[1:]
+        if kind not in ('p', 'u') or not raw_id.isdigit():
+            continue
+        skill_id = int(raw_id)
+        if skill_id not in skill_ids:
+            submission.errors[skill_id] = 'Skill does not exist.'
+        elif kind == 'u':
+            used_recently.add(skill_id)
+        elif value in _PROFICIENCIES:
+            proficiencies[skill_id] = _PROFICIENCIES[value]
+        else:
+            submission.errors[skill_id] = 'Invalid proficiency value.'
+    for skill_id in used_recently - proficiencies.keys():
+        submission.errors.setdefault(skill_id, 'This field is required.')
+    for skill_id, proficiency in proficiencies.items():
+        if skill_id not in submission.errors:
+            submission.entries[skill_id] = (
+                proficiency,
+                skill_id in used_recently,
+            )
+    return submission
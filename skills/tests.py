@@ -1,3 +1,1035 @@
-from django.test import TestCase
+import csv
+import json
+import re
 
-# Create your tests here.
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.db.models import Value
+from django.db.models.functions import Concat
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.budgets import SEED_EMAIL, ViewBudgetMixin, Visit, seed
+from core.caching import get_generation, private_cache
+from organisation.models import REFERENCE_GENERATION, Grade, Profession, Unit
+from users.models import Gender, Profile, User
+
+from .analytics import proficiency_breakdown
+from .experts import Requirement, find_experts
+from .models import (
+    ENTRY_GENERATION,
+    TAXONOMY_GENERATION,
+    Category,
+    Skill,
+    SkillCoverage,
+    SkillEntry,
+    _make_tree_nodes,
+    _SkillTreeNode,
+)
+from .pagination import paginate_by_last_modified
+from .pivot import get_pivot
+from .search import SEARCH_TABLE, find_people, search_skills
+from .skeleton import get_skeleton
+from .submissions import parse_submission
+
+
+class ViewBudgetTests(ViewBudgetMixin, TestCase):
+    namespace = 'skills'
+
+    def get_visits(self) -> list[Visit]:
+        category = Category.objects.get(name='Coding')
+        skill = Skill.objects.get(name='Python')
+        other = Skill.objects.exclude(pk=skill.pk).earliest('pk')
+        bulk = '\n'.join(
+            json.dumps({
+                'user': SEED_EMAIL.format(0),
+                'skill': skill.id,
+                'proficiency': proficiency,
+            })
+            for proficiency in (1, 2)
+        )
+        return [
+            Visit('skills:overview', queries=3),
+            Visit(
+                'skills:overview',
+                queries=10,
+                method='post',
+                data={f'p{skill.id}': '3', f'u{skill.id}': 'on'},
+            ),
+            Visit(
+                'skills:category',
+                queries=6,
+                kwargs={'pk': category.pk},
+            ),
+            Visit(
+                'skills:category',
+                queries=6,
+                kwargs={'pk': category.pk},
+                params={'partial': 1},
+            ),
+            Visit('skills:matrix', queries=4),
+            Visit('skills:export', queries=2),
+            Visit('skills:export', queries=2, params={'format': 'ndjson'}),
+            Visit('skills:grid', queries=5),
+            Visit('skills:grid', queries=4, params={'format': 'json'}),
+            Visit('skills:analytics', queries=2, params={'by': 'grade'}),
+            Visit(
+                'skills:analytics',
+                queries=3,
+                params={'by': 'unit', 'skill': skill.id},
+            ),
+            Visit('skills:search', queries=4, params={'q': 'pyth'}),
+            Visit('skills:search', queries=4, params={'q': 'pythn'}),
+            Visit(
+                'skills:search',
+                queries=5,
+                params={'q': 'py', 'skill': skill.id},
+            ),
+            Visit('skills:api_entries', queries=2),
+            Visit(
+                'skills:api_bulk_entries',
+                queries=13,
+                method='post',
+                data=bulk,
+                content_type='application/x-ndjson',
+                staff=True,
+            ),
+            Visit(
+                'skills:api_experts',
+                queries=2,
+                params={'need': [f'{skill.id}:1:2', f'{other.id}:2']},
+            ),
+            Visit(
+                'skills:api_experts',
+                queries=2,
+                params={
+                    'need': [f'{skill.id}:3', f'{other.id}'],
+                    'match': 'any',
+                    'grade': 1,
+                },
+            ),
+        ]
+
+
+@override_settings(API_TOKENS=['secret'])
+class BulkEntriesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='bulk@example.com')
+        cls.skill = Skill.objects.get(name='Python')
+
+    def post(self, *lines: object, **headers: str):
+        client = Client(enforce_csrf_checks=True)
+        return client.post(
+            reverse('skills:api_bulk_entries'),
+            '\n'.join(json.dumps(line) for line in lines),
+            content_type='application/x-ndjson',
+            headers=headers,
+        )
+
+    def record(self, proficiency: int = 2) -> dict[str, object]:
+        return {
+            'user': self.user.email,
+            'skill': self.skill.id,
+            'proficiency': proficiency,
+        }
+
+    def test_tokens_authenticate_without_csrf(self):
+        first = self.post(self.record(), Authorization='Bearer secret')
+        second = self.post(
+            self.record(),
+            {'user': 'nobody@example.com', 'skill': self.skill.id},
+            Authorization='Bearer secret',
+        )
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()['results'], [
+            {'line': 1, 'status': 'written'},
+        ])
+        self.assertEqual(second.json()['results'], [
+            {'line': 1, 'status': 'unchanged'},
+            {
+                'line': 2,
+                'status': 'error',
+                'error': 'Invalid proficiency value.',
+            },
+        ])
+        self.assertEqual(
+            SkillEntry.objects.get(user=self.user).proficiency,
+            2,
+        )
+
+    def test_proficiencies_must_be_integers(self):
+        response = self.post(
+            self.record(proficiency=True),
+            {**self.record(), 'proficiency': 1.0},
+            Authorization='Bearer secret',
+        )
+        self.assertEqual(
+            [result['error'] for result in response.json()['results']],
+            ['Invalid proficiency value.'] * 2,
+        )
+        self.assertFalse(SkillEntry.objects.exists())
+
+    def test_unknown_tokens_are_refused(self):
+        response = self.post(self.record(), Authorization='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(SkillEntry.objects.exists())
+
+    def test_sessions_still_need_a_csrf_token(self):
+        staff = User.objects.create(email='staff@example.com', is_staff=True)
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(staff)
+        response = client.post(
+            reverse('skills:api_bulk_entries'),
+            json.dumps(self.record()),
+            content_type='application/x-ndjson',
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(SkillEntry.objects.exists())
+
+    def test_database_errors_fail_the_chunk_records(self):
+        with mock.patch.object(
+            SkillEntry,
+            'bulk_upsert',
+            side_effect=OperationalError('database is locked'),
+        ):
+            response = self.post(self.record(), Authorization='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['errors'], 1)
+        self.assertEqual(response.json()['results'][0]['status'], 'error')
+
+
+
+@override_settings(API_TOKENS=['secret'])
+class EntriesApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='entries@example.com')
+        cls.skill = Skill.objects.get(name='Python')
+        SkillEntry.bulk_upsert([(cls.user.pk, cls.skill.id, 3, True)])
+
+    def test_tokens_authenticate(self):
+        response = self.client.get(
+            reverse('skills:api_entries'),
+            headers={'Authorization': 'Bearer secret'},
+        )
+        self.assertEqual(response.status_code, 200)
+        result, = response.json()['results']
+        self.assertEqual(
+            (result['user'], result['skill'], result['proficiency']),
+            (self.user.email, self.skill.id, 3),
+        )
+
+    def test_anonymous_clients_get_a_json_error(self):
+        for headers in ({}, {'Authorization': 'Bearer wrong'}):
+            with self.subTest(headers=headers):
+                response = self.client.get(
+                    reverse('skills:api_entries'),
+                    headers=headers,
+                )
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response['WWW-Authenticate'], 'Bearer')
+                self.assertEqual(
+                    response.json(),
+                    {'error': 'Authentication required.'},
+                )
+
+    def test_sessions_authenticate(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('skills:api_entries'))
+        self.assertEqual(len(response.json()['results']), 1)
+
+
+class PaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(email='pages@example.com')
+        SkillEntry.bulk_upsert(
+            (user.pk, skill_id, 2, False)
+            for skill_id in Skill.objects.values_list('id', flat=True)
+        )
+        # Pairs of entries share a timestamp, so pages must break ties on
+        # the id.
+        now = timezone.now()
+        pks = SkillEntry.objects.values_list('pk', flat=True)
+        for i, pk in enumerate(pks):
+            SkillEntry.objects.filter(pk=pk).update(
+                last_modified=now - timedelta(minutes=i // 2),
+            )
+
+    def walk(self, size: int) -> list[list[int]]:
+        pages = []
+        cursor = None
+        while True:
+            page = paginate_by_last_modified(
+                SkillEntry.objects.all(),
+                cursor,
+                size,
+            )
+            pages.append([entry.pk for entry in page.items])
+            if page.next_cursor is None:
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_entry_once_in_order(self):
+        expected = list(SkillEntry.objects.order_by(
+            '-last_modified',
+            '-id',
+        ).values_list('pk', flat=True))
+        for size in (1, 2, 3, len(expected), len(expected) + 1):
+            with self.subTest(size=size):
+                pages = self.walk(size)
+                self.assertEqual(sum(pages, []), expected)
+                self.assertTrue(all(len(page) == size for page in pages[:-1]))
+                self.assertTrue(pages[-1])
+
+    def test_invalid_cursors_are_refused(self):
+        with self.assertRaisesMessage(ValueError, 'Invalid cursor.'):
+            paginate_by_last_modified(SkillEntry.objects.all(), 'nope', 2)
+        self.client.force_login(User.objects.get(email='pages@example.com'))
+        response = self.client.get(
+            reverse('skills:api_entries'),
+            {'cursor': 'nope'},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.skill = Skill.objects.get(name='Python')
+        with_profile = User.objects.create(email='profile@example.com')
+        Profile.objects.create(
+            user=with_profile,
+            gender=Gender.objects.earliest('pk'),
+            grade=Grade.objects.earliest('pk'),
+            profession=Profession.objects.earliest('pk'),
+            unit=Unit.objects.earliest('pk'),
+            years_as_analyst=1,
+            years_at_current_grade=1,
+        )
+        without_profile = User.objects.create(email='bare@example.com')
+        SkillEntry.bulk_upsert([
+            (with_profile.pk, cls.skill.id, 3, True),
+            (without_profile.pk, cls.skill.id, 1, False),
+        ])
+        cls.user = with_profile
+
+    def export(self, **params: str) -> str:
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('skills:export'), params)
+        return b''.join(response.streaming_content).decode()
+
+    def expected(self) -> list[dict[str, object]]:
+        records = []
+        for entry in SkillEntry.objects.order_by('id'):
+            profile = getattr(entry.user, 'profile', None)
+            records.append({
+                'user': entry.user.email,
+                'grade': profile and profile.grade.name,
+                'unit': profile and profile.unit.name,
+                'profession': profile and profile.profession.name,
+                'gender': profile and profile.gender.name,
+                'skill_id': self.skill.id,
+                'category': 'Coding -> Interpreted Languages',
+                'skill': 'Python',
+                'proficiency': entry.proficiency,
+                'used_in_last_six_months': entry.used_in_last_six_months,
+                'last_modified': entry.last_modified.isoformat(),
+            })
+        return records
+
+    def test_ndjson(self):
+        lines = self.export(format='ndjson').splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(records, self.expected())
+
+    def test_csv(self):
+        rows = list(csv.DictReader(self.export().splitlines()))
+        self.assertEqual(rows, [
+            {
+                key: '' if value is None else str(value)
+                for key, value in record.items()
+            }
+            for record in self.expected()
+        ])
+
+    def test_unknown_formats_are_refused(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('skills:export'), {'format': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+
+class BreakdownTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = Skill.objects.get(name='Python').id
+        cls.css = Skill.objects.get(name='CSS').id
+        cls.grades = list(Grade.objects.order_by('pk')[:2])
+        users = []
+        for i, grade in enumerate([*cls.grades, None]):
+            user = User.objects.create(email=f'{i}@example.com')
+            if grade is not None:
+                Profile.objects.create(
+                    user=user,
+                    gender=Gender.objects.earliest('pk'),
+                    grade=grade,
+                    profession=Profession.objects.earliest('pk'),
+                    unit=Unit.objects.earliest('pk'),
+                    years_as_analyst=1,
+                    years_at_current_grade=1,
+                )
+            users.append(user.pk)
+        SkillEntry.bulk_upsert([
+            (users[0], cls.python, 3, True),
+            (users[0], cls.css, 3, False),
+            (users[1], cls.python, 1, False),
+            (users[2], cls.python, 2, True),
+        ])
+
+    def setUp(self):
+        self.enterContext(private_cache())
+
+    def breakdown(
+        self,
+        skill_id: int | None = None,
+    ) -> dict[str | None, tuple[int, int, dict[str, int]]]:
+        return {
+            group['name']: (
+                group['total'],
+                group['used_in_last_six_months'],
+                {k: v for k, v in group['proficiency'].items() if v},
+            )
+            for group in proficiency_breakdown('grade', skill_id)
+        }
+
+    def test_entries_are_counted_by_group_and_proficiency(self):
+        first, second = (grade.name for grade in self.grades)
+        self.assertEqual(self.breakdown(), {
+            first: (2, 1, {'3': 2}),
+            second: (1, 0, {'1': 1}),
+            None: (1, 1, {'2': 1}),
+        })
+        self.assertEqual(self.breakdown(self.css), {first: (1, 0, {'3': 1})})
+
+    def test_writes_are_picked_up(self):
+        self.breakdown()
+        user = User.objects.get(email='1@example.com')
+        SkillEntry.bulk_upsert([(user.pk, self.python, 4, True)])
+        self.assertEqual(
+            self.breakdown(self.python)[self.grades[1].name],
+            (1, 1, {'4': 1}),
+        )
+
+
+class GenerationTests(TestCase):
+    @contextmanager
+    def assertBumps(self, name: str) -> Iterator[None]:
+        before = get_generation(name)
+        yield
+        self.assertGreater(get_generation(name), before)
+
+    def test_taxonomy_writes_bump_the_taxonomy(self):
+        category = Category.objects.get(name='Coding')
+        with self.assertBumps(TAXONOMY_GENERATION):
+            skill = Skill.objects.create(name='Rust', category=category)
+        with self.assertBumps(TAXONOMY_GENERATION):
+            skill.delete()
+        with self.assertBumps(TAXONOMY_GENERATION):
+            Skill.objects.bulk_create([Skill(name='Go', category=category)])
+        with self.assertBumps(TAXONOMY_GENERATION):
+            Skill.objects.filter(name='Go').update(name='Golang')
+        with self.assertBumps(TAXONOMY_GENERATION):
+            Category.objects.filter(pk=category.pk).update(name='Code')
+
+    def test_entry_writes_bump_the_entries(self):
+        user = User.objects.create(email='generations@example.com')
+        skill = Skill.objects.get(name='Python')
+        with self.assertBumps(ENTRY_GENERATION):
+            SkillEntry.objects.bulk_create([SkillEntry(
+                user=user,
+                skill=skill,
+                proficiency=1,
+                used_in_last_six_months=False,
+            )])
+        with self.assertBumps(ENTRY_GENERATION):
+            SkillEntry.objects.filter(user=user).update(proficiency=2)
+        with self.assertBumps(ENTRY_GENERATION):
+            SkillEntry.objects.filter(user=user).delete()
+
+    def test_lookup_writes_bump_the_reference(self):
+        with self.assertBumps(REFERENCE_GENERATION):
+            Grade.objects.update(name=Concat('name', Value('!')))
+        with self.assertBumps(REFERENCE_GENERATION):
+            Unit.objects.bulk_create([Unit(name='New unit')])
+
+
+class TreeTests(TestCase):
+    def shape(self, nodes: list[_SkillTreeNode]) -> list[tuple[object, ...]]:
+        return [
+            (
+                node.name,
+                [skill.name for skill in node.skills],
+                self.shape(node.subnodes),
+            )
+            for node in nodes
+        ]
+
+    def test_taxonomy_is_loaded_in_two_queries(self):
+        # Subcategories holding no skills are pruned, while top-level ones
+        # are kept and marked as having none.
+        empty = Category.objects.create(name='Empty')
+        Category.objects.create(name='Also empty', parent=empty)
+        with self.assertNumQueries(2):
+            nodes = _make_tree_nodes()
+        self.assertEqual(self.shape(nodes), [
+            ('Analysis', ['Business Cases'], []),
+            ('Coding', ['CSS'], [
+                ('Compiled Languages', ['C#', 'C++'], []),
+                ('Interpreted Languages', ['Javascript', 'Python'], []),
+            ]),
+            ('Empty', [], []),
+        ])
+        self.assertEqual(
+            [node.has_skills for node in nodes],
+            [True, True, False],
+        )
+
+
+class SkeletonTests(TestCase):
+    def checked(self, entries: dict[int, tuple[int, bool]]) -> set[str]:
+        coding = Category.objects.get(name='Coding')
+        markup = get_skeleton(coding.pk).render(entries)
+        self.assertNotIn('\x00', markup)
+        return {
+            f'{name}={value}'
+            for name, value in re.findall(
+                r'<input type="\w+" name="(\w+)"(?: value="(\d+)")? checked>',
+                markup,
+            )
+        }
+
+    def test_entries_check_their_inputs(self):
+        python = Skill.objects.get(name='Python').id
+        css = Skill.objects.get(name='CSS').id
+        self.assertEqual(self.checked({}), set())
+        self.assertEqual(
+            self.checked({python: (3, True), css: (0, False)}),
+            {f'p{python}=3', f'u{python}=', f'p{css}=0'},
+        )
+
+    def test_markup_is_shared_between_users(self):
+        coding = Category.objects.get(name='Coding')
+        get_skeleton(coding.pk)
+        with self.assertNumQueries(0):
+            self.assertIs(get_skeleton(coding.pk), get_skeleton(coding.pk))
+
+
+class MatrixConditionalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed(10)
+
+    def setUp(self):
+        self.url = reverse('skills:matrix')
+        response = self.client.get(self.url)
+        self.etag = response.headers['ETag']
+
+    def revalidate(self):
+        return self.client.get(self.url, headers={'If-None-Match': self.etag})
+
+    def test_unchanged_pages_are_not_modified(self):
+        # The first response set the CSRF cookie, which must not stop the
+        # client's first revalidation from matching.
+        self.assertEqual(self.revalidate().status_code, 304)
+
+    def test_no_last_modified_is_sent(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', response.headers)
+        response = self.client.get(self.url, headers={
+            'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT',
+        })
+        self.assertEqual(response.status_code, 200)
+
+    def test_deleted_entries_change_the_page(self):
+        SkillEntry.objects.earliest('pk').delete()
+        self.assertEqual(self.revalidate().status_code, 200)
+
+    def test_profile_changes_change_the_page(self):
+        profile = Profile.objects.earliest('pk')
+        profile.years_as_analyst += 1
+        profile.save()
+        self.assertEqual(self.revalidate().status_code, 200)
+
+    def test_queryset_updates_change_the_page(self):
+        entry = SkillEntry.objects.earliest('last_modified')
+        SkillEntry.objects.filter(pk=entry.pk).update(
+            proficiency=(entry.proficiency + 1) % 5,
+        )
+        self.assertEqual(self.revalidate().status_code, 200)
+
+
+class CategoryConditionalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='category@example.com')
+        cls.skill = Skill.objects.get(name='Python')
+        SkillEntry.bulk_upsert([(cls.user.pk, cls.skill.id, 2, False)])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse(
+            'skills:category',
+            kwargs={'pk': self.skill.category_id},
+        )
+        self.etag = self.client.get(self.url).headers['ETag']
+
+    def revalidate(self):
+        return self.client.get(self.url, headers={'If-None-Match': self.etag})
+
+    def test_unchanged_pages_are_not_modified(self):
+        self.assertEqual(self.revalidate().status_code, 304)
+
+    def test_queryset_updates_change_the_page(self):
+        SkillEntry.objects.filter(user=self.user).update(proficiency=4)
+        response = self.revalidate()
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'value="4" checked')
+
+
+class SkillCoverageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='coverage@example.com')
+        cls.skill = Skill.objects.get(name='Python')
+
+    def counts(self) -> dict[int, tuple[int, int]]:
+        return {
+            proficiency: (users, recent)
+            for proficiency, users, recent in SkillCoverage.objects.filter(
+                skill=self.skill,
+                user_count__gt=0,
+            ).values_list('proficiency', 'user_count', 'recent_user_count')
+        }
+
+    def make_entry(self) -> SkillEntry:
+        return SkillEntry(
+            user=self.user,
+            skill=self.skill,
+            proficiency=2,
+            used_in_last_six_months=False,
+        )
+
+    def test_first_entry_is_counted_once(self):
+        SkillCoverage.objects.filter(skill=self.skill).delete()
+        self.make_entry().save()
+        self.assertEqual(self.counts(), {2: (1, 0)})
+
+    def test_changes_move_the_entry_between_buckets(self):
+        entry = self.make_entry()
+        entry.save()
+        entry.proficiency = 4
+        entry.used_in_last_six_months = True
+        entry.save()
+        self.assertEqual(self.counts(), {4: (1, 1)})
+        entry.delete()
+        self.assertEqual(self.counts(), {})
+
+    def test_check_fails_on_inconsistent_rows(self):
+        self.make_entry().save()
+        call_command('rebuild_skill_coverage', '--check', stdout=StringIO())
+        SkillCoverage.objects.filter(
+            skill=self.skill,
+            proficiency=2,
+        ).update(user_count=5)
+        with self.assertRaisesMessage(
+            CommandError,
+            '1 coverage rows are inconsistent.',
+        ):
+            call_command(
+                'rebuild_skill_coverage',
+                '--check',
+                stdout=StringIO(),
+            )
+        self.assertEqual(self.counts()[2], (5, 0))
+
+    def test_bulk_writes_are_counted(self):
+        SkillEntry.bulk_upsert([(self.user.pk, self.skill.id, 3, True)])
+        SkillEntry.bulk_upsert([(self.user.pk, self.skill.id, 1, False)])
+        self.assertEqual(self.counts(), {1: (1, 0)})
+
+
+class BulkUpsertTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='upsert@example.com')
+        cls.skill = Skill.objects.get(name='Python')
+
+    def test_only_changed_rows_are_written(self):
+        row = (self.user.pk, self.skill.id, 2, False)
+        self.assertEqual(len(SkillEntry.bulk_upsert([row])), 1)
+        entry = SkillEntry.objects.get(user=self.user)
+        self.assertEqual(SkillEntry.bulk_upsert([row]), [])
+        self.assertEqual(
+            SkillEntry.objects.get(pk=entry.pk).last_modified,
+            entry.last_modified,
+        )
+        written = SkillEntry.bulk_upsert([
+            (self.user.pk, self.skill.id, 3, True),
+        ])
+        self.assertEqual(len(written), 1)
+        entry.refresh_from_db()
+        self.assertEqual(
+            (entry.proficiency, entry.used_in_last_six_months),
+            (3, True),
+        )
+        self.assertEqual(SkillEntry.objects.filter(user=self.user).count(), 1)
+
+
+class CategoryPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = Category.objects.create(name='Root')
+        cls.child = Category.objects.create(name='Child', parent=cls.root)
+        cls.leaf = Category.objects.create(name='Leaf', parent=cls.child)
+
+    def test_paths_and_labels_are_maintained(self):
+        self.assertEqual(
+            self.leaf.path,
+            f'/{self.root.pk}/{self.child.pk}/{self.leaf.pk}/',
+        )
+        self.assertEqual(self.leaf.label, 'Root -> Child -> Leaf')
+        self.assertEqual(
+            self.leaf.ancestor_ids,
+            [self.root.pk, self.child.pk],
+        )
+        self.assertEqual(
+            set(self.child.subtree()),
+            {self.child, self.leaf},
+        )
+
+    def test_subtrees_exclude_ids_sharing_a_prefix(self):
+        # e.g. /10/ must not be found under /1/.
+        coding = Category.objects.get(name='Coding')
+        number = 0
+        while True:
+            number += 1
+            other = Category.objects.create(name=f'Other {number}')
+            if str(other.pk).startswith(str(coding.pk)):
+                break
+        self.assertNotIn(other, coding.subtree())
+        self.assertEqual(
+            set(coding.subtree()),
+            set(Category.objects.filter(label__startswith='Coding')),
+        )
+
+    def test_renames_rewrite_the_subtree(self):
+        self.root.name = 'Renamed'
+        self.root.save()
+        self.leaf.refresh_from_db()
+        self.assertEqual(self.leaf.label, 'Renamed -> Child -> Leaf')
+
+    def test_moves_rewrite_the_subtree(self):
+        other = Category.objects.get(name='Analysis')
+        self.child.parent = other
+        self.child.save()
+        self.leaf.refresh_from_db()
+        self.assertEqual(
+            self.leaf.path,
+            f'/{other.pk}/{self.child.pk}/{self.leaf.pk}/',
+        )
+        self.assertEqual(self.leaf.label, 'Analysis -> Child -> Leaf')
+        self.assertFalse(self.root.subtree().exclude(pk=self.root.pk))
+
+    def test_loops_are_rejected(self):
+        for parent in (self.root, self.leaf):
+            with self.subTest(parent=parent.name):
+                self.root.parent = parent
+                with self.assertRaisesMessage(
+                    ValidationError,
+                    'Loop detected in parent chain.',
+                ):
+                    self.root.save()
+        self.root.refresh_from_db()
+        self.assertIsNone(self.root.parent_id)
+        self.assertEqual(self.root.path, f'/{self.root.pk}/')
+
+
+class PivotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first = User.objects.create(email='b@example.com')
+        cls.second = User.objects.create(email='a@example.com')
+        cls.skill = Skill.objects.get(name='Python')
+        SkillEntry.bulk_upsert([(cls.first.pk, cls.skill.id, 2, False)])
+
+    def setUp(self):
+        # Rolling back a test leaves the generations it bumped behind, so
+        # each test starts from an empty cache.
+        self.enterContext(private_cache())
+
+    def cells(self, skill: Skill | None = None) -> dict[str, int | None]:
+        skill = skill or self.skill
+        pivot = get_pivot({})
+        column = [c.skill_id for c in pivot.columns].index(skill.id)
+        return {
+            email: cells[column]
+            for email, cells in pivot.rows()
+            if cells[column] is not None
+        }
+
+    def test_entry_writes_update_the_cached_pivot(self):
+        self.assertEqual(self.cells(), {'b@example.com': 2})
+        SkillEntry.bulk_upsert([
+            (self.first.pk, self.skill.id, 4, False),
+            (self.second.pk, self.skill.id, 1, True),
+        ])
+        # Only the recently modified entries are read again.
+        with self.assertNumQueries(1):
+            cells = self.cells()
+        self.assertEqual(
+            list(cells.items()),
+            [('a@example.com', 1), ('b@example.com', 4)],
+        )
+
+    def test_queryset_updates_reach_the_cached_pivot(self):
+        # The entry predates the pivot's watermark by more than the slack.
+        SkillEntry.objects.filter(user=self.first).update(
+            last_modified=timezone.now() - timedelta(days=1),
+        )
+        SkillEntry.bulk_upsert([(self.second.pk, self.skill.id, 1, False)])
+        self.cells()
+        SkillEntry.objects.filter(user=self.first).update(proficiency=4)
+        self.assertEqual(
+            self.cells(),
+            {'a@example.com': 1, 'b@example.com': 4},
+        )
+
+    def test_moved_entries_leave_their_old_cell(self):
+        css = Skill.objects.get(name='CSS')
+        self.cells()
+        entry = SkillEntry.objects.get(user=self.first)
+        entry.skill = css
+        entry.save()
+        self.assertEqual(self.cells(), {})
+        self.assertEqual(self.cells(css), {'b@example.com': 2})
+
+    def test_pivots_from_the_replica_are_rebuilt(self):
+        # A raw delete stands in for a write the replica had not seen.
+        with mock.patch('skills.pivot.replica_timeout', return_value=0):
+            self.cells()
+        SkillEntry.objects.filter(user=self.first)._raw_delete('default')
+        self.assertEqual(self.cells(), {})
+
+    def test_deletions_rebuild_the_pivot(self):
+        self.cells()
+        SkillEntry.objects.filter(user=self.first).delete()
+        self.assertEqual(self.cells(), {})
+
+
+class SubmissionTests(TestCase):
+    def test_fields_are_parsed_and_checked(self):
+        python, css, javascript = (
+            Skill.objects.get(name=name).id
+            for name in ('Python', 'CSS', 'Javascript')
+        )
+        missing = Skill.objects.latest('pk').id + 1
+        submission = parse_submission({
+            'csrfmiddlewaretoken': 'token',
+            f'p{python}': '3',
+            f'u{python}': 'on',
+            f'p{css}': '0',
+            f'p{javascript}': '9',
+            f'u{Skill.objects.get(name="C++").id}': 'on',
+            f'p{missing}': '1',
+        })
+        self.assertEqual(submission.entries, {
+            python: (3, True),
+            css: (0, False),
+        })
+        self.assertEqual(submission.errors, {
+            javascript: 'Invalid proficiency value.',
+            Skill.objects.get(name='C++').id: 'This field is required.',
+            missing: 'Skill does not exist.',
+        })
+
+    def test_overview_saves_entries_and_reports_errors(self):
+        user = User.objects.create(email='overview@example.com')
+        skill = Skill.objects.get(name='Python')
+        self.client.force_login(user)
+        response = self.client.post(reverse('skills:overview'), {
+            f'p{skill.id}': '4',
+            f'p{skill.id + 1000}': '1',
+        }, follow=True)
+        entry = SkillEntry.objects.get(user=user)
+        self.assertEqual(
+            (entry.skill_id, entry.proficiency, entry.used_in_last_six_months),
+            (skill.id, 4, False),
+        )
+        self.assertEqual(
+            [str(message) for message in response.context['messages']],
+            [f'Skill #{skill.id + 1000}: Skill does not exist.'],
+        )
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = Skill.objects.get(name='Python')
+        SkillEntry.bulk_upsert([
+            (User.objects.create(email=email).pk, cls.python.id, p, used)
+            for email, p, used in [
+                ('c@example.com', 2, False),
+                ('b@example.com', 4, False),
+                ('a@example.com', 4, True),
+                ('d@example.com', 0, False),
+            ]
+        ])
+
+    def names(self, query: str) -> list[str]:
+        return [hit.name for hit in search_skills(query)]
+
+    def test_skills_are_found_by_name_and_category(self):
+        hit, = search_skills('pyth')
+        self.assertEqual(
+            (hit.id, hit.name, hit.category, hit.people),
+            (self.python.id, 'Python', 'Coding -> Interpreted Languages', 3),
+        )
+        self.assertEqual(self.names('c'), ['C#', 'C++', 'CSS'])
+        self.assertEqual(
+            sorted(self.names('interpreted')),
+            ['Javascript', 'Python'],
+        )
+        self.assertEqual(self.names('   '), [])
+
+    def test_misspellings_are_matched(self):
+        if SEARCH_TABLE not in connection.introspection.table_names():
+            self.skipTest('Fuzzy matching needs the FTS5 index.')
+        self.assertEqual(self.names('pythn'), ['Python'])
+
+    def test_people_are_ranked_by_proficiency(self):
+        self.assertEqual(
+            [
+                (person.email, person.proficiency, person.used_recently)
+                for person in find_people(self.python.id)
+            ],
+            [
+                ('a@example.com', 4, True),
+                ('b@example.com', 4, False),
+                ('c@example.com', 2, False),
+            ],
+        )
+
+    def test_view_returns_skills_and_people(self):
+        self.client.force_login(User.objects.get(email='a@example.com'))
+        response = self.client.get(reverse('skills:search'), {
+            'q': 'pyth',
+            'skill': self.python.id,
+            'format': 'json',
+        })
+        self.assertEqual(response.json()['skills'], [{
+            'id': self.python.id,
+            'name': 'Python',
+            'category': 'Coding -> Interpreted Languages',
+            'people': 3,
+        }])
+        self.assertEqual(
+            [person['user'] for person in response.json()['people']],
+            ['a@example.com', 'b@example.com', 'c@example.com'],
+        )
+
+
+class ExpertTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = Skill.objects.get(name='Python').id
+        cls.css = Skill.objects.get(name='CSS').id
+        users = {
+            email: User.objects.create(email=email).pk
+            for email in ('a@example.com', 'b@example.com', 'c@example.com')
+        }
+        SkillEntry.bulk_upsert([
+            (users['a@example.com'], cls.python, 4, True),
+            (users['a@example.com'], cls.css, 2, False),
+            (users['b@example.com'], cls.python, 3, False),
+            (users['b@example.com'], cls.css, 4, True),
+            (users['c@example.com'], cls.python, 4, False),
+        ])
+
+    def requirements(self, minimum: int = 1) -> list[Requirement]:
+        return [
+            Requirement(self.python, minimum=minimum, weight=2),
+            Requirement(self.css),
+        ]
+
+    def ranking(self, **kwargs) -> list[tuple[str, float]]:
+        return [
+            (expert['user'], expert['score'])
+            for expert in find_experts(self.requirements(), **kwargs)
+        ]
+
+    def test_experts_are_ranked_by_weighted_score(self):
+        self.assertEqual(
+            self.ranking(),
+            [('a@example.com', 12), ('b@example.com', 11)],
+        )
+        self.assertEqual(self.ranking(match_all=False), [
+            ('a@example.com', 12),
+            ('b@example.com', 11),
+            ('c@example.com', 8),
+        ])
+        self.assertEqual(
+            self.ranking(recent_bonus=0),
+            [('a@example.com', 10), ('b@example.com', 10)],
+        )
+
+    def test_scores_are_broken_down_by_skill(self):
+        expert = find_experts(self.requirements())[0]
+        self.assertEqual(expert['matched'], 2)
+        self.assertEqual(expert['skills'], [
+            {
+                'skill': self.python,
+                'proficiency': 4,
+                'used_in_last_six_months': True,
+                'score': 10,
+            },
+            {
+                'skill': self.css,
+                'proficiency': 2,
+                'used_in_last_six_months': False,
+                'score': 2,
+            },
+        ])
+
+    def test_minimums_exclude_entries(self):
+        experts = find_experts(self.requirements(minimum=4))
+        self.assertEqual([e['user'] for e in experts], ['a@example.com'])
+
+    def test_api(self):
+        self.client.force_login(User.objects.get(email='a@example.com'))
+        url = reverse('skills:api_experts')
+        response = self.client.get(url, {
+            'need': [f'{self.python}:1:2', f'{self.css}'],
+            'match': 'any',
+            'limit': 2,
+        })
+        self.assertEqual(
+            [result['user'] for result in response.json()['results']],
+            ['a@example.com', 'b@example.com'],
+        )
+        response = self.client.get(url, {
+            'need': [f'{self.python}', f'{self.python}:2'],
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {'error': 'Each skill may only be required once.'},
+        )
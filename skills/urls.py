@@ -1,9 +1,26 @@
 from django.urls import path
 
-from .views import matrix, overview
+from .api import bulk_entries, entries, experts
+from .views import (
+    analytics,
+    category,
+    export,
+    grid,
+    matrix,
+    overview,
+    search,
+)
 
 app_name = 'skills'
 urlpatterns = [
     path('', overview, name='overview'),
+    path('category/<int:pk>/', category, name='category'),
     path('matrix/', matrix, name='matrix'),
+    path('matrix/export/', export, name='export'),
+    path('grid/', grid, name='grid'),
+    path('analytics/', analytics, name='analytics'),
+    path('search/', search, name='search'),
+    path('api/entries/', entries, name='api_entries'),
+    path('api/entries/bulk/', bulk_entries, name='api_bulk_entries'),
+    path('api/experts/', experts, name='api_experts'),
 ]
@@ -1,69 +1,266 @@
-from typing import Any
-
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required, login_not_required
-from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
-from django.shortcuts import redirect, render
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseNotAllowed,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.db.models import Max
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_GET
+from django.views.decorators.vary import vary_on_cookie
+
+from core.caching import get_generation, get_generations
+from core.routers import reporting
+from organisation.models import REFERENCE_GENERATION
+from users.models import PROFILE_GENERATION, get_reference
+
+from .analytics import BREAKDOWN_DIMENSIONS, proficiency_breakdown
+from .conditional import Validators, conditional_page
+from .exports import iter_csv, iter_ndjson
+from .models import (
+    ENTRY_REMOVAL_GENERATION,
+    TAXONOMY_GENERATION,
+    Category,
+    Skill,
+    SkillEntry,
+    subtree_filter,
+)
+from .pagination import paginate_by_last_modified
+from .pivot import get_pivot, parse_filters
+from .search import find_people, search_skills
+from .skeleton import get_skeleton, get_top_level_nodes
+from .submissions import parse_submission
+
+MATRIX_PAGE_SIZE = 100
+
+
+def _overview_validators(request: HttpRequest) -> Validators:
+    return [get_generation(TAXONOMY_GENERATION)]
+
+
+# Every entry write, including QuerySet.update(), moves last_modified
+# forward, so the latest timestamp stands in for the entry generation.
+# Deletions leave no timestamp behind and bump a generation instead.
+def _category_validators(request: HttpRequest, pk: int) -> Validators:
+    generations = get_generations(
+        TAXONOMY_GENERATION,
+        ENTRY_REMOVAL_GENERATION,
+    )
+    last_modified = SkillEntry.objects.filter(
+        user=request.user,
+    ).aggregate(Max('last_modified'))['last_modified__max']
+    return [pk, *generations.values(), last_modified]
 
-from .forms import SkillEntryFormset
-from .models import Category, Skill, SkillEntry
+
+def _matrix_validators(request: HttpRequest) -> Validators:
+    generations = get_generations(
+        TAXONOMY_GENERATION,
+        ENTRY_REMOVAL_GENERATION,
+        PROFILE_GENERATION,
+        REFERENCE_GENERATION,
+    )
+    last_modified = SkillEntry.objects.aggregate(
+        Max('last_modified'),
+    )['last_modified__max']
+    return [*generations.values(), last_modified]
 
 
 @login_required
+@cache_control(private=True, no_cache=True)
+@conditional_page(_overview_validators)
 def overview(request: HttpRequest) -> HttpResponse:
     if request.method == 'GET':
-        initial: list[dict[str, Any]] = []
-        entries = SkillEntry.objects.filter(user=request.user)
-        entries_lookup = {entry.skill.id: entry for entry in entries}
-        for skill in Skill.objects.all():
-            entry = entries_lookup.get(skill.id)
-            if entry is not None:
-                initial.append({
-                    'skill_id': skill.id,
-                    'proficiency': entry.proficiency,
-                    'used_in_last_six_months': entry.used_in_last_six_months,
-                })
-            else:
-                initial.append({
-                    'skill_id': skill.id,
-                    'proficiency': None,
-                    'used_in_last_six_months': False,
-                })
-        formset = SkillEntryFormset(initial=initial)
-        mapping = {form.initial['skill_id']: form for form in formset}
+        context = {'categories': get_top_level_nodes()}
+        return render(request, 'skills/overview.html', context)
     elif request.method == 'POST':
-        formset = SkillEntryFormset(data=request.POST)
-        for form in formset:
-            if not form.has_changed() or not form.is_valid():
-                continue
-            proficiency = form.cleaned_data['proficiency']
-            used_recently = form.cleaned_data['used_in_last_six_months']
-            entry, created = SkillEntry.objects.get_or_create(
-                user=request.user,
-                skill=form.cleaned_data['skill'],
-                defaults={
-                    'proficiency': proficiency,
-                    'used_in_last_six_months': used_recently,
-                },
-            )
-            if not created:
-                if entry.proficiency == proficiency:
-                    if entry.used_in_last_six_months == used_recently:
-                        continue
-                entry.proficiency = proficiency
-                entry.used_in_last_six_months = used_recently
-                entry.save()
-        mapping = {form.cleaned_data['skill_id']: form for form in formset}
+        submission = parse_submission(request.POST)
+        SkillEntry.bulk_upsert(
+            (request.user.pk, skill_id, proficiency, used_recently)
+            for skill_id, (proficiency, used_recently)
+            in submission.entries.items()
+        )
+        for skill_id, error in submission.errors.items():
+            messages.error(request, f'Skill #{skill_id}: {error}')
         return redirect('skills:overview')
     else:
         return HttpResponseNotAllowed(['GET', 'POST'])
-    tree = Category.make_tree(mapping)
-    context = {
-        'formset': formset,
-        'tree': tree,
-    }
-    return render(request, 'skills/overview.html', context)
+
+
+@require_GET
+@cache_control(private=True, no_cache=True)
+@conditional_page(_category_validators)
+def category(request: HttpRequest, pk: int) -> HttpResponse:
+    # Returns one category's subtree of skills with the user's entries.
+    # The overview loads these on demand; without ?partial=1 the subtree
+    # is served as a page of its own.
+    instance = get_object_or_404(Category, pk=pk)
+    entries = SkillEntry.objects.filter(
+        subtree_filter(instance.path, 'skill__category__path'),
+        user=request.user,
+    ).values_list('skill_id', 'proficiency', 'used_in_last_six_months')
+    tree = get_skeleton(instance.id).render({
+        skill_id: (proficiency, used_recently)
+        for skill_id, proficiency, used_recently in entries
+    })
+    context = {'category': instance, 'tree': tree}
+    if request.GET.get('partial'):
+        return render(request, 'skills/category_form.html', context)
+    return render(request, 'skills/category.html', context)
+
 
 @login_not_required
+@reporting
+@cache_control(no_cache=True)
+@vary_on_cookie
+@conditional_page(_matrix_validators)
 def matrix(request: HttpRequest) -> HttpResponse:
-    entries = SkillEntry.objects.order_by('-last_modified')
-    return render(request, 'skills/matrix.html', {'entries': entries})
+    entries = SkillEntry.objects.select_related(
+        'user__profile',
+        'skill__category',
+    )
+    try:
+        page = paginate_by_last_modified(
+            entries,
+            request.GET.get('cursor'),
+            MATRIX_PAGE_SIZE,
+        )
+    except ValueError:
+        return HttpResponseBadRequest('Invalid cursor.')
+    reference = get_reference()
+    rows = []
+    for entry in page.items:
+        profile = getattr(entry.user, 'profile', None)
+        names = profile.lookup_names(reference) if profile else {}
+        rows.append((entry, names))
+    context = {
+        'rows': rows,
+        'next_cursor': page.next_cursor,
+        'is_first_page': not request.GET.get('cursor'),
+    }
+    return render(request, 'skills/matrix.html', context)
+
+
+@require_GET
+@reporting
+def export(request: HttpRequest) -> HttpResponse:
+    export_format = request.GET.get('format', 'csv')
+    match export_format:
+        case 'csv':
+            content, content_type = iter_csv(), 'text/csv'
+        case 'ndjson':
+            content, content_type = iter_ndjson(), 'application/x-ndjson'
+        case _:
+            return HttpResponseBadRequest('Unsupported export format.')
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response['Content-Disposition'] = (
+        f'attachment; filename="skills_matrix.{export_format}"'
+    )
+    return response
+
+
+@require_GET
+@reporting
+def grid(request: HttpRequest) -> HttpResponse:
+    try:
+        filters = parse_filters(request.GET)
+    except ValueError:
+        return HttpResponseBadRequest('Invalid filter.')
+    pivot = get_pivot(filters)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'groups': [
+                {'label': group.label, 'span': group.span}
+                for group in pivot.groups
+            ],
+            'skills': [
+                {'id': column.skill_id, 'name': column.name}
+                for column in pivot.columns
+            ],
+            'rows': [
+                {'user': email, 'proficiencies': cells}
+                for email, cells in pivot.rows()
+            ],
+        })
+    context = {
+        'pivot': pivot,
+        'rows': pivot.rows(),
+        'filters': filters,
+        'choices': {
+            kind: [{'id': pk, 'name': name} for pk, name in names.items()]
+            for kind, names in get_reference().items()
+        },
+    }
+    return render(request, 'skills/grid.html', context)
+
+
+@require_GET
+@reporting
+def analytics(request: HttpRequest) -> HttpResponse:
+    dimension = request.GET.get('by', '')
+    if dimension not in BREAKDOWN_DIMENSIONS:
+        return HttpResponseBadRequest('Unsupported breakdown dimension.')
+    skill = None
+    if request.GET.get('skill'):
+        try:
+            skill = Skill.objects.select_related('category').get(
+                pk=int(request.GET['skill']),
+            )
+        except (ValueError, Skill.DoesNotExist):
+            return HttpResponseBadRequest('Invalid skill.')
+    return JsonResponse({
+        'by': dimension,
+        'skill': None if skill is None else {
+            'id': skill.id,
+            'name': str(skill),
+        },
+        'groups': proficiency_breakdown(
+            dimension,
+            None if skill is None else skill.id,
+        ),
+    })
+
+
+@require_GET
+@reporting
+def search(request: HttpRequest) -> HttpResponse:
+    # Finds skills by name or category, and with ?skill=<id>, the people
+    # who have some experience of that skill.
+    query = request.GET.get('q', '')
+    skill = None
+    if request.GET.get('skill'):
+        try:
+            skill = Skill.objects.select_related('category').get(
+                pk=int(request.GET['skill']),
+            )
+        except (ValueError, Skill.DoesNotExist):
+            return HttpResponseBadRequest('Invalid skill.')
+    hits = search_skills(query)
+    people = [] if skill is None else find_people(skill.id)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'query': query,
+            'skills': [
+                {
+                    'id': hit.id,
+                    'name': hit.name,
+                    'category': hit.category,
+                    'people': hit.people,
+                }
+                for hit in hits
+            ],
+            'people': [
+                {
+                    'user': person.email,
+                    'proficiency': person.proficiency,
+                    'used_in_last_six_months': person.used_recently,
+                }
+                for person in people
+            ],
+        })
+    context = {'query': query, 'hits': hits, 'skill': skill, 'people': people}
+    return render(request, 'skills/search.html', context)
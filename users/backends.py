@@ -0,0 +1,44 @@
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .models import User, user_cache_key
+
+# A cache held by each process would keep a changed or deactivated user
+# signed in on every worker but the one that saved the change.
+_PER_PROCESS_CACHES = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+def _is_shared() -> bool:
+    return settings.CACHES['default']['BACKEND'] not in _PER_PROCESS_CACHES
+
+
+class CachedModelBackend(ModelBackend):
+    # Resolves the user behind a session from the cache, so a page that
+    # only needs request.user makes no query for it. Entries are dropped
+    # when the user is saved, updated, deleted or logs out, and otherwise
+    # expire after USER_CACHE_TIMEOUT seconds. Users are only cached when
+    # the cache is shared between workers.
+    def get_user(self, user_id: Any) -> User | None:
+        if not _is_shared():
+            return super().get_user(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
+
+    async def aget_user(self, user_id: Any) -> User | None:
+        if not _is_shared():
+            return await super().aget_user(user_id)
+        key = user_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                await cache.aset(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
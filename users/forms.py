@@ -1,7 +1,11 @@
+from collections.abc import Iterator
+from typing import Any
+
 from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
 
-from .models import Gender, Profile
-from organisation.models import Grade, Profession, Unit
+from .models import REFERENCE_MODELS, Profile, get_reference
 
 
 class LoginForm(forms.Form):
@@ -9,11 +13,57 @@ class LoginForm(forms.Form):
     password = forms.CharField(widget=forms.PasswordInput)
 
 
+class _ReferenceChoiceIterator(ModelChoiceIterator):
+    def __iter__(self) -> Iterator[tuple[Any, str]]:
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        yield from get_reference()[self.field.kind].items()
+
+    def __len__(self) -> int:
+        return (
+            len(get_reference()[self.field.kind])
+            + (self.field.empty_label is not None)
+        )
+
+    def __bool__(self) -> bool:
+        return self.field.empty_label is not None or bool(
+            get_reference()[self.field.kind],
+        )
+
+
+class ReferenceChoiceField(forms.ModelChoiceField):
+    # Offers and checks choices against the reference cache rather than
+    # querying the table. A valid choice cleans to an unsaved instance
+    # carrying its id and name, which is all a foreign key needs.
+    iterator = _ReferenceChoiceIterator
+
+    def __init__(self, kind: str, **kwargs: Any):
+        self.kind = kind
+        model = REFERENCE_MODELS[kind]
+        super().__init__(queryset=model._default_manager.all(), **kwargs)
+
+    def to_python(self, value: Any) -> Any:
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+        try:
+            pk = int(value)
+            name = get_reference()[self.kind][pk]
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return self.queryset.model(pk=pk, name=name)
+
+
 class ProfileForm(forms.ModelForm):
-    gender: Gender
-    grade: Grade
-    profession: Profession
-    unit: Unit
+    gender = ReferenceChoiceField('gender')
+    grade = ReferenceChoiceField('grade')
+    profession = ReferenceChoiceField('profession')
+    unit = ReferenceChoiceField('unit')
     years_as_analyst: int
     years_at_current_grade: int
 
@@ -0,0 +1,145 @@
+import json
+
+from collections.abc import Iterable, Mapping
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from organisation.models import Grade, Profession, Unit
+
+from .models import Gender, Profile, User
+
+PROFILE_LOOKUPS: dict[str, type[Gender | Grade | Profession | Unit]] = {
+    'gender': Gender,
+    'grade': Grade,
+    'profession': Profession,
+    'unit': Unit,
+}
+PROFILE_NUMBERS = ('years_as_analyst', 'years_at_current_grade')
+
+
+@dataclass
+class UserRecord:
+    email: str
+    password: str | None
+    profile: dict[str, int] | None
+
+
+def load_lookups() -> dict[str, dict[str, int]]:
+    # Names are resolved against one query per lookup table, rather than
+    # one query per imported row.
+    return {
+        field: dict(model.objects.values_list('name', 'id'))
+        for field, model in PROFILE_LOOKUPS.items()
+    }
+
+
+def _parse_number(field: str, value: Any) -> int:
+    # CSV gives numbers as strings and JSON as numbers.
+    if value is None or value == '':
+        raise ValueError(f'Missing {field}.')
+    if isinstance(value, str) and value.strip().isdecimal():
+        value = int(value.strip())
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f'{field} must be a whole number.')
+    if value < 0:
+        raise ValueError(f'{field} must not be negative.')
+    return value
+
+
+def parse_user(
+    record: str | bytes | Mapping[str, Any],
+    lookups: Mapping[str, Mapping[str, int]],
+) -> UserRecord:
+    # Records hold an email, an optional password and, optionally, every
+    # profile field, with lookups given by name. A blank password leaves
+    # the account with an unusable one, as for single sign-on.
+    if isinstance(record, (str, bytes)):
+        try:
+            record = json.loads(record)
+        except ValueError:
+            raise ValueError('Invalid JSON.')
+    if not isinstance(record, Mapping):
+        raise ValueError('Record must be an object.')
+    email = record.get('email')
+    if not isinstance(email, str):
+        raise ValueError('Email must be a string.')
+    email = User.objects.normalize_email(email.strip())
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise ValueError('Invalid email.')
+    password = record.get('password') or None
+    if password is not None and not isinstance(password, str):
+        raise ValueError('Password must be a string.')
+    fields = [*PROFILE_LOOKUPS, *PROFILE_NUMBERS]
+    if not any(record.get(field) not in (None, '') for field in fields):
+        return UserRecord(email=email, password=password, profile=None)
+    profile: dict[str, int] = {}
+    for field, ids in lookups.items():
+        name = record.get(field)
+        if name not in ids:
+            raise ValueError(f'Unknown {field}: {name!r}.')
+        profile[f'{field}_id'] = ids[name]
+    for field in PROFILE_NUMBERS:
+        profile[field] = _parse_number(field, record.get(field))
+    return UserRecord(email=email, password=password, profile=profile)
+
+
+def hash_passwords(
+    passwords: list[str | None],
+    executor: Executor | None = None,
+) -> list[str]:
+    # Hashing dominates an import, so with an executor the hashes are
+    # spread across its workers. Missing passwords are marked unusable
+    # without going through the pool.
+    hashes = [make_password(None)] * len(passwords)
+    given = [i for i, password in enumerate(passwords) if password]
+    if executor is None:
+        hashed = map(make_password, (passwords[i] for i in given))
+    else:
+        hashed = executor.map(
+            make_password,
+            [passwords[i] for i in given],
+            chunksize=8,
+        )
+    for i, password_hash in zip(given, hashed):
+        hashes[i] = password_hash
+    return hashes
+
+
+def write_users(
+    records: Iterable[UserRecord],
+    executor: Executor | None = None,
+) -> tuple[list[User], list[UserRecord]]:
+    # Returns the users created and the records skipped because their
+    # email is already taken. Each call is one transaction.
+    records = list(records)
+    taken = set(User.objects.filter(
+        email__in=[record.email for record in records],
+    ).values_list('email', flat=True))
+    new: list[UserRecord] = []
+    skipped: list[UserRecord] = []
+    for record in records:
+        if record.email in taken:
+            skipped.append(record)
+        else:
+            taken.add(record.email)
+            new.append(record)
+    hashes = hash_passwords([record.password for record in new], executor)
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            User(email=record.email, password=password_hash)
+            for record, password_hash in zip(new, hashes)
+        )
+        Profile.objects.bulk_create(
+            Profile(user=user, **record.profile)
+            for user, record in zip(users, new)
+            if record.profile is not None
+        )
+    return users, skipped
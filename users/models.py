@@ -1,8 +1,51 @@
+from collections.abc import Iterable, Mapping
+from typing import Any
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth import models as auth_models
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.db.models import Value
+
+from core.caching import GenerationalQuerySet, get_or_build
+from organisation.models import (
+    REFERENCE_GENERATION,
+    Grade,
+    Profession,
+    ReferenceQuerySet,
+    Unit,
+)
+
+PROFILE_GENERATION = 'users.profiles'
+
+
+def user_cache_key(user_id: Any) -> str:
+    return f'users:user:{user_id}'
+
+
+def forget_users(user_ids: Iterable[Any]):
+    # Cached users are dropped straight away, and again on commit in case
+    # another worker cached the old row in the meantime.
+    keys = [user_cache_key(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class _UserQuerySet(models.QuerySet[Any]):
+    # Bulk updates send no signals, so they drop the cached users here.
+    # bulk_update() is implemented in terms of update().
+    def update(self, **kwargs: Any) -> int:
+        with transaction.atomic():
+            user_ids = list(self.values_list('pk', flat=True))
+            rows = super().update(**kwargs)
+            forget_users(user_ids)
+        return rows
+
 
-from organisation.models import Grade, Profession, Unit
+class UserManager(auth_models.UserManager.from_queryset(_UserQuerySet)):
+    pass
 
 
 class User(AbstractUser):
@@ -12,6 +55,7 @@ class User(AbstractUser):
     profile: 'Profile'
     email = models.EmailField(unique=True)
     username = None
+    objects = UserManager()
 
     class Meta:
         db_table = 'users_users'
@@ -19,6 +63,7 @@ class User(AbstractUser):
 
 class Gender(models.Model):
     name = models.CharField(max_length=255, unique=True)
+    objects = ReferenceQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -27,7 +72,53 @@ class Gender(models.Model):
         db_table = 'users_genders'
 
 
+REFERENCE_MODELS: dict[str, type[models.Model]] = {
+    'gender': Gender,
+    'grade': Grade,
+    'profession': Profession,
+    'unit': Unit,
+}
+
+
+def _make_reference() -> dict[str, dict[int, str]]:
+    # All four tables are read in one UNION ALL.
+    querysets = [
+        model._default_manager.annotate(kind=Value(kind)).values_list(
+            'kind',
+            'id',
+            'name',
+        )
+        for kind, model in REFERENCE_MODELS.items()
+    ]
+    rows = querysets[0].union(*querysets[1:], all=True)
+    reference: dict[str, dict[int, str]] = {
+        kind: {} for kind in REFERENCE_MODELS
+    }
+    for kind, pk, name in sorted(rows, key=lambda row: row[2]):
+        reference[kind][pk] = name
+    return reference
+
+
+def get_reference() -> dict[str, dict[int, str]]:
+    # The names of every gender, grade, profession and unit, by kind and
+    # id and in name order. They are small and rarely change, so they are
+    # kept in each process until any of them is written.
+    return get_or_build(
+        'users:reference',
+        (REFERENCE_GENERATION,),
+        _make_reference,
+    )
+
+
+class _ProfileQuerySet(GenerationalQuerySet):
+    generations = (PROFILE_GENERATION,)
+
+
 class Profile(models.Model):
+    gender_id: int
+    grade_id: int
+    profession_id: int
+    unit_id: int
     user = models.OneToOneField(
         to=get_user_model(),
         on_delete=models.CASCADE,
@@ -55,9 +146,27 @@ class Profile(models.Model):
     )
     years_as_analyst = models.PositiveSmallIntegerField()
     years_at_current_grade = models.PositiveSmallIntegerField()
+    objects = _ProfileQuerySet.as_manager()
 
     def __str__(self):
         return f'Details for {self.user.email}'
 
+    def lookup_names(
+        self,
+        reference: Mapping[str, Mapping[int, str]] | None = None,
+    ) -> dict[str, str]:
+        # Pages showing many profiles fetch the reference once and pass it
+        # in. An id the reference does not know yet, because it was read
+        # just before a lookup was added, is read from its table instead.
+        if reference is None:
+            reference = get_reference()
+        names = {}
+        for kind in REFERENCE_MODELS:
+            name = reference[kind].get(getattr(self, f'{kind}_id'))
+            if name is None:
+                name = getattr(self, kind).name
+            names[kind] = name
+        return names
+
     class Meta:
         db_table = 'users_profiles'
@@ -0,0 +1,80 @@
+import asyncio
+import multiprocessing
+
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, TypeVar
+
+import django
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    BasePasswordHasher,
+    get_hasher,
+    identify_hasher,
+    is_password_usable,
+)
+
+from .models import User
+
+T = TypeVar('T')
+
+_executor: Executor | None = None
+
+
+def _get_executor() -> Executor | None:
+    # The pool is started from a running, multithreaded server, so its
+    # workers are spawned rather than forked, which could copy a lock
+    # held by another thread. Each sets Django up before unpickling work
+    # from this module, which imports the models.
+    global _executor
+    if _executor is None and settings.PASSWORD_HASH_WORKERS > 0:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        )
+    return _executor
+
+
+def _verify(
+    hasher: BasePasswordHasher,
+    password: str,
+    encoded: str,
+) -> bool:
+    return hasher.verify(password, encoded)
+
+
+def _encode(hasher: BasePasswordHasher, password: str) -> str:
+    return hasher.encode(password, hasher.salt())
+
+
+async def _run(function: Callable[..., T], *args: Any) -> T:
+    # Hashers are resolved from settings here and sent to the workers, so
+    # every worker hashes with this process's configuration.
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), function, *args)
+
+
+async def acheck_password(user: User | None, password: str) -> bool:
+    # Checks the password without blocking the event loop. Unknown users
+    # and unusable passwords still cost one hash, so response times do
+    # not reveal which emails have accounts. Hashes made with an outdated
+    # hasher or parameters are upgraded on a successful check.
+    default = get_hasher('default')
+    if user is None or not is_password_usable(user.password):
+        await _run(_encode, default, password)
+        return False
+    try:
+        hasher = identify_hasher(user.password)
+    except ValueError:
+        await _run(_encode, default, password)
+        return False
+    if not await _run(_verify, hasher, password, user.password):
+        return False
+    if hasher.algorithm != default.algorithm or hasher.must_update(
+        user.password,
+    ):
+        user.password = await _run(_encode, default, password)
+        await user.asave(update_fields=['password'])
+    return True
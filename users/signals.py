@@ -0,0 +1,40 @@
+from typing import Any
+
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.caching import bump_generation
+from organisation.models import REFERENCE_GENERATION
+
+from .models import (
+    PROFILE_GENERATION,
+    Gender,
+    Profile,
+    User,
+    forget_users,
+)
+
+
+@receiver([post_save, post_delete], sender=Profile)
+def profile_changed(**kwargs: Any):
+    bump_generation(PROFILE_GENERATION)
+
+
+@receiver([post_save, post_delete], sender=Gender)
+def gender_changed(**kwargs: Any):
+    # Genders are part of the reference data with the organisation's
+    # lookups.
+    bump_generation(REFERENCE_GENERATION)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(instance: User, **kwargs: Any):
+    # Covers password changes, which are saved like any other change.
+    forget_users([instance.pk])
+
+
+@receiver(user_logged_out)
+def user_logged_out_handler(user: User | None, **kwargs: Any):
+    if user is not None:
+        forget_users([user.pk])
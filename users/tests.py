@@ -1,3 +1,247 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from core.budgets import ViewBudgetMixin, Visit
+from organisation.models import Grade, Profession, Unit
+
+from .backends import CachedModelBackend
+from .forms import ProfileForm
+from .imports import load_lookups, parse_user
+from .models import REFERENCE_MODELS, Gender, Profile, User, get_reference
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class ViewBudgetTests(ViewBudgetMixin, TestCase):
+    namespace = 'users'
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User(email='login@example.com')
+        user.set_password('pw')
+        user.save()
+
+    def get_visits(self) -> list[Visit]:
+        profile = {
+            'gender': Gender.objects.earliest('pk').pk,
+            'grade': Grade.objects.earliest('pk').pk,
+            'profession': Profession.objects.earliest('pk').pk,
+            'unit': Unit.objects.earliest('pk').pk,
+            'years_as_analyst': 5,
+            'years_at_current_grade': 2,
+        }
+        return [
+            Visit('users:login', queries=0, anonymous=True),
+            Visit(
+                'users:login',
+                queries=9,
+                method='post',
+                data={'email': 'login@example.com', 'password': 'pw'},
+                anonymous=True,
+            ),
+            Visit('users:logout', queries=3, method='post'),
+            Visit('users:view_profile', queries=3),
+            Visit('users:edit_profile', queries=3),
+            Visit(
+                'users:edit_profile',
+                queries=8,
+                method='post',
+                data=profile,
+            ),
+        ]
+
+
+class ReferenceTests(TestCase):
+    def test_renames_are_picked_up(self):
+        for kind, model in [('grade', Grade), ('gender', Gender)]:
+            with self.subTest(kind):
+                instance = model.objects.earliest('pk')
+                self.assertEqual(
+                    get_reference()[kind][instance.pk],
+                    instance.name,
+                )
+                instance.name = f'Renamed {kind}'
+                instance.save()
+                with self.assertNumQueries(1):
+                    self.assertEqual(
+                        get_reference()[kind][instance.pk],
+                        f'Renamed {kind}',
+                    )
+                with self.assertNumQueries(0):
+                    get_reference()
+
+    def test_new_genders_are_offered(self):
+        get_reference()
+        gender = Gender.objects.create(name='New')
+        self.assertIn(gender.pk, get_reference()['gender'])
+        form = ProfileForm(data=self.profile_data(gender=gender.pk))
+        self.assertTrue(form.is_valid(), form.errors)
+        gender.delete()
+        self.assertNotIn(gender.pk, get_reference()['gender'])
+
+    def profile_data(self, **kwargs: int) -> dict[str, int]:
+        return {
+            'gender': Gender.objects.earliest('pk').pk,
+            'grade': Grade.objects.earliest('pk').pk,
+            'profession': Profession.objects.earliest('pk').pk,
+            'unit': Unit.objects.earliest('pk').pk,
+            'years_as_analyst': 5,
+            'years_at_current_grade': 2,
+            **kwargs,
+        }
+
+    def test_form_checks_choices_against_the_reference(self):
+        form = ProfileForm(data=self.profile_data(
+            grade=Grade.objects.latest('pk').pk + 1,
+        ))
+        self.assertEqual(list(form.errors), ['grade'])
+
+    def test_form_rejects_lookups_deleted_behind_the_reference(self):
+        # A raw delete sends no signals, so the reference still has it.
+        grade = Grade.objects.create(name='Deleted')
+        get_reference()
+        Grade.objects.filter(pk=grade.pk)._raw_delete('default')
+        form = ProfileForm(data=self.profile_data(grade=grade.pk))
+        self.assertEqual(list(form.errors), ['grade'])
+
+    def test_names_fall_back_to_the_tables(self):
+        user = User.objects.create(email='names@example.com')
+        profile = Profile.objects.create(
+            user=user,
+            gender_id=Gender.objects.earliest('pk').pk,
+            grade_id=Grade.objects.earliest('pk').pk,
+            profession_id=Profession.objects.earliest('pk').pk,
+            unit_id=Unit.objects.earliest('pk').pk,
+            years_as_analyst=1,
+            years_at_current_grade=1,
+        )
+        reference = {kind: {} for kind in REFERENCE_MODELS}
+        reference['gender'] = get_reference()['gender']
+        names = profile.lookup_names(reference)
+        self.assertEqual(names['grade'], profile.grade.name)
+        self.assertEqual(names['gender'], profile.gender.name)
+
+
+class CachedModelBackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='cached@example.com')
+
+    def test_users_are_cached(self):
+        backend = CachedModelBackend()
+        backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(backend.get_user(self.user.pk), self.user)
+
+    def test_updates_drop_cached_users(self):
+        backend = CachedModelBackend()
+        backend.get_user(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertIsNone(backend.get_user(self.user.pk))
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    })
+    def test_per_process_caches_are_not_used(self):
+        backend = CachedModelBackend()
+        backend.get_user(self.user.pk)
+        with self.assertNumQueries(1):
+            backend.get_user(self.user.pk)
+
+
+class ParseUserTests(TestCase):
+    def record(self, **kwargs: object) -> dict[str, object]:
+        return {
+            'email': 'Import@Example.com',
+            'gender': Gender.objects.earliest('pk').name,
+            'grade': Grade.objects.earliest('pk').name,
+            'profession': Profession.objects.earliest('pk').name,
+            'unit': Unit.objects.earliest('pk').name,
+            'years_as_analyst': '4',
+            'years_at_current_grade': 1,
+            **kwargs,
+        }
+
+    def test_profiles_are_resolved(self):
+        user = parse_user(self.record(), load_lookups())
+        self.assertEqual(user.email, 'Import@example.com')
+        self.assertIsNone(user.password)
+        assert user.profile is not None
+        self.assertEqual(user.profile['years_as_analyst'], 4)
+        self.assertEqual(
+            user.profile['grade_id'],
+            Grade.objects.earliest('pk').pk,
+        )
+
+    def test_invalid_numbers_are_reported(self):
+        lookups = load_lookups()
+        for value, error in [
+            (None, 'Missing years_as_analyst.'),
+            ('four', 'years_as_analyst must be a whole number.'),
+            (True, 'years_as_analyst must be a whole number.'),
+            (-1, 'years_as_analyst must not be negative.'),
+        ]:
+            with self.subTest(value=value):
+                with self.assertRaisesMessage(ValueError, error):
+                    parse_user(
+                        self.record(years_as_analyst=value),
+                        lookups,
+                    )
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class LoginTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User(email='login@example.com')
+        cls.user.set_password('pw')
+        cls.user.save()
+
+    def login(self, email: str, password: str):
+        return self.client.post(
+            reverse('users:login'),
+            {'email': email, 'password': password},
+        )
+
+    def test_valid_credentials_log_in(self):
+        response = self.login('login@example.com', 'pw')
+        self.assertRedirects(
+            response,
+            reverse('skills:overview'),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(
+            int(self.client.session['_auth_user_id']),
+            self.user.pk,
+        )
+
+    def test_invalid_credentials_are_refused(self):
+        for email, password in [
+            ('login@example.com', 'wrong'),
+            ('nobody@example.com', 'pw'),
+        ]:
+            with self.subTest(email=email):
+                response = self.login(email, password)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    response.context['form'].non_field_errors(),
+                    ['Invalid email or password.'],
+                )
+                self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_next_is_followed(self):
+        matrix = reverse('skills:matrix')
+        response = self.client.post(
+            f'{reverse("users:login")}?next={matrix}',
+            {'email': 'login@example.com', 'password': 'pw'},
+        )
+        self.assertRedirects(
+            response,
+            matrix,
+            fetch_redirect_response=False,
+        )
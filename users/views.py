@@ -1,14 +1,15 @@
 from typing import cast
 
-from django.contrib.auth import get_user_model, login, logout
+from asgiref.sync import sync_to_async
+from django.contrib.auth import alogin, logout
 from django.contrib.auth.decorators import login_not_required
-from django.core.exceptions import ObjectDoesNotExist
 from django.http import HttpRequest, HttpResponse, HttpResponseNotAllowed
 from django.views.decorators.http import require_POST
 from django.shortcuts import redirect, render
 
 from .forms import LoginForm, ProfileForm
 from .models import User
+from .passwords import acheck_password
 
 
 def edit_profile(request: HttpRequest) -> HttpResponse:
@@ -35,12 +36,17 @@ def view_profile(request: HttpRequest) -> HttpResponse:
     if not hasattr(user, 'profile'):
         return redirect('users:edit_profile')
     profile = user.profile
-    return render(request, 'users/view_profile.html', {'profile': profile})
+    return render(request, 'users/view_profile.html', {
+        'profile': profile,
+        'names': profile.lookup_names(),
+    })
 
 
 @login_not_required
-def login_view(request: HttpRequest) -> HttpResponse:
-    if request.user.is_authenticated:
+async def login_view(request: HttpRequest) -> HttpResponse:
+    # Runs asynchronously so that password hashing, done in a separate
+    # pool, never holds up other requests on the same worker.
+    if (await request.auser()).is_authenticated:
         return redirect(request.GET.get('next', 'skills:overview'))
     match request.method:
         case 'GET':
@@ -50,17 +56,18 @@ def login_view(request: HttpRequest) -> HttpResponse:
             if form.is_valid():
                 email = form.cleaned_data['email']
                 password = form.cleaned_data['password']
-                try:
-                    user = get_user_model().objects.get(email=email)
-                    if not user.check_password(password):
-                        raise ValueError('Incorrect password.')
-                    login(request, user)
+                user = await User.objects.filter(email=email).afirst()
+                if await acheck_password(user, password):
+                    await alogin(request, user)
                     return redirect(request.GET.get('next', 'skills:overview'))
-                except (ObjectDoesNotExist, ValueError):
-                    form.add_error(None, 'Invalid email or password.')
+                form.add_error(None, 'Invalid email or password.')
         case _:
             return HttpResponseNotAllowed(['GET', 'POST'])
-    return render(request, 'users/login.html', {'form': form})
+    return await sync_to_async(render)(
+        request,
+        'users/login.html',
+        {'form': form},
+    )
 
 
 @require_POST
@@ -5,12 +5,24 @@ from .application import (
     WSGI_APPLICATION as WSGI_APPLICATION,
 )
 from .authentication import (
+    AUTH_PASSWORD_VALIDATORS as AUTH_PASSWORD_VALIDATORS,
     AUTH_USER_MODEL as AUTH_USER_MODEL,
+    AUTHENTICATION_BACKENDS as AUTHENTICATION_BACKENDS,
     LOGIN_URL as LOGIN_URL,
+    PASSWORD_HASH_WORKERS as PASSWORD_HASH_WORKERS,
+    PASSWORD_HASHERS as PASSWORD_HASHERS,
+    USER_CACHE_TIMEOUT as USER_CACHE_TIMEOUT,
+)
+from .caching import (
+    CACHES as CACHES,
+    TEST_RUNNER as TEST_RUNNER,
 )
 from .database import (
+    DATABASE_PROFILE as DATABASE_PROFILE,
+    DATABASE_ROUTERS as DATABASE_ROUTERS,
     DATABASES as DATABASES,
     DEFAULT_AUTO_FIELD as DEFAULT_AUTO_FIELD,
+    REPLICA_PIN_SECONDS as REPLICA_PIN_SECONDS,
 )
 from .debugging import (
     DEBUG as DEBUG,
@@ -29,5 +41,9 @@ from .internationalisation import (
     USE_TZ as USE_TZ,
 )
 from .security import (
+    API_TOKENS as API_TOKENS,
     SECRET_KEY as SECRET_KEY,
 )
+from .sessions import (
+    SESSION_ENGINE as SESSION_ENGINE,
+)
@@ -1,10 +1,27 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False)
+
 AUTH_USER_MODEL = 'users.User'
 
 AUTH_PASSWORD_VALIDATORS = []
 
+AUTHENTICATION_BACKENDS = ['users.backends.CachedModelBackend']
+
+# The user behind each session is cached for this many seconds, and
+# dropped straight away when the user is saved or logs out.
+USER_CACHE_TIMEOUT = int(os.environ.get('USER_CACHE_TIMEOUT', '300'))
+
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.Argon2PasswordHasher',
     'django.contrib.auth.hashers.PBKDF2PasswordHasher',
 ]
 
+# Logins verify passwords in a pool of this many processes, so hashing
+# does not hold up the event loop or the GIL. With 0, hashes are verified
+# on the default thread pool instead.
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '2'))
+
 LOGIN_URL = 'users:login'
@@ -0,0 +1,39 @@
+import os
+
+from dotenv import load_dotenv
+
+from .files import BASE_DIR
+
+load_dotenv(override=False)
+
+_FILE_BASED_CACHE = 'django.core.cache.backends.filebased.FileBasedCache'
+
+# Generation counters and cached results must be shared by every worker,
+# or a write in one worker never invalidates what the others hold. The
+# default file-based cache is shared by the workers on one host and kept
+# in this checkout, so instances on the same host never share one. Several
+# hosts need a networked backend, such as Redis or Memcached, set through
+# both of these variables. A per-process cache like LocMemCache is only
+# safe with a single worker.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', _FILE_BASED_CACHE),
+        'LOCATION': os.environ.get(
+            'CACHE_LOCATION',
+            str(BASE_DIR / '.cache'),
+        ),
+    }
+}
+
+# The file-based cache culls a third of its entries, chosen at random,
+# once it holds MAX_ENTRIES, which defaults to only 300. Users, skeletons
+# and per-query results need far more than that. Every write also lists
+# the cache directory, so busy sites are better served by Redis.
+if CACHES['default']['BACKEND'] == _FILE_BASED_CACHE:
+    CACHES['default']['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '100000')),
+    }
+
+# Test runs get a cache of their own, so they never read or invalidate
+# what the development server has cached.
+TEST_RUNNER = 'core.runner.TestRunner'
@@ -1,10 +1,114 @@
+import os
+
+from typing import Any
+
+from dotenv import load_dotenv
+
 from .files import BASE_DIR
 
-DATABASES = {
-    'default': {
+load_dotenv(override=False)
+
+# The database profile is chosen by DATABASE_PROFILE:
+#   sqlite          - a tuned SQLite database (the default)
+#   sqlite-untuned  - SQLite with Django's defaults, for comparison
+#   postgresql      - PostgreSQL with a connection pool, which requires
+#                     psycopg with its pool extra to be installed
+DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'sqlite')
+
+# WAL lets readers carry on while a write is in progress, and NORMAL
+# synchronisation is safe under WAL. Writers queue for the lock for up to
+# the busy timeout instead of failing with "database is locked", and take
+# it as soon as their transaction begins, so a reader never has to
+# upgrade to a writer part way through.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -32 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def _sqlite(tuned: bool) -> dict[str, Any]:
+    database: dict[str, Any] = {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DATABASE_NAME', BASE_DIR / 'db.sqlite3'),
+    }
+    if tuned:
+        database['CONN_MAX_AGE'] = None
+        database['CONN_HEALTH_CHECKS'] = True
+        database['OPTIONS'] = {
+            'init_command': ''.join(
+                f'PRAGMA {name}={value};'
+                for name, value in SQLITE_PRAGMAS.items()
+            ),
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+            'transaction_mode': 'IMMEDIATE',
+        }
+    return database
+
+
+def _postgresql() -> dict[str, Any]:
+    # Pooled connections replace persistent ones, so CONN_MAX_AGE stays 0.
+    # Server-side cursors let exports stream through .iterator(), but have
+    # to be turned off behind a transaction-pooling proxy like PgBouncer.
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('DATABASE_NAME', 'cardano'),
+        'USER': os.environ.get('DATABASE_USER', ''),
+        'PASSWORD': os.environ.get('DATABASE_PASSWORD', ''),
+        'HOST': os.environ.get('DATABASE_HOST', ''),
+        'PORT': os.environ.get('DATABASE_PORT', ''),
+        'CONN_MAX_AGE': 0,
+        'DISABLE_SERVER_SIDE_CURSORS': (
+            os.environ.get('DATABASE_SERVER_SIDE_CURSORS', 'True').upper()
+            != 'TRUE'
+        ),
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.environ.get('DATABASE_POOL_MIN', '2')),
+                'max_size': int(os.environ.get('DATABASE_POOL_MAX', '10')),
+                'timeout': 10,
+            },
+        },
     }
+
+
+match DATABASE_PROFILE:
+    case 'sqlite':
+        _default = _sqlite(tuned=True)
+    case 'sqlite-untuned':
+        _default = _sqlite(tuned=False)
+    case 'postgresql':
+        _default = _postgresql()
+    case _:
+        raise ValueError(f'Unknown DATABASE_PROFILE: {DATABASE_PROFILE}')
+
+DATABASES = {
+    'default': _default,
 }
 
+# Reporting views read from a replica when DATABASE_REPLICA_NAME or
+# DATABASE_REPLICA_HOST is set. It shares every other setting with the
+# primary, and keeping it up to date is left to the database. For local
+# testing with SQLite, the name can point at a copy of the primary file.
+_replica_variables = ('DATABASE_REPLICA_NAME', 'DATABASE_REPLICA_HOST')
+if any(name in os.environ for name in _replica_variables):
+    DATABASES['replica'] = {
+        **_default,
+        'NAME': os.environ.get('DATABASE_REPLICA_NAME', _default['NAME']),
+        'HOST': os.environ.get(
+            'DATABASE_REPLICA_HOST',
+            _default.get('HOST', ''),
+        ),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# After a request writes, the client reads from the primary for this many
+# seconds.
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', '5'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -6,3 +6,11 @@ load_dotenv(override=False)
 
 # The secret key must be loaded from the environment or a .env file.
 SECRET_KEY = os.environ['SECRET_KEY']
+
+# Machine clients of the API authenticate with one of these tokens, given
+# as a comma-separated list, instead of a session and CSRF token.
+API_TOKENS = [
+    token.strip()
+    for token in os.environ.get('API_TOKENS', '').split(',')
+    if token.strip()
+]
@@ -0,0 +1,13 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv(override=False)
+
+# Sessions are read from the cache and only fall back to the database on
+# a miss. They are written through to the database, which only happens
+# when a session changes, e.g. on login or logout.
+SESSION_ENGINE = os.environ.get(
+    'SESSION_ENGINE',
+    'django.contrib.sessions.backends.cached_db',
+)